@@ -8,6 +8,7 @@ adds NOAA-specific fields as needed.
 
 import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 import gspread
 import gspread_formatting as gsf
 import pandas as pd
@@ -70,7 +71,7 @@ def FAIRe2NOAA(client=None, project_id=None):
         raise FileNotFoundError(f"NOAA checklist not found at {noaa_checklist_path}")
     
     # Total number of steps
-    total_steps = 7
+    total_steps = 6
     
     try:
         # Get the worksheets
@@ -78,62 +79,82 @@ def FAIRe2NOAA(client=None, project_id=None):
         experiment_metadata = spreadsheet.worksheet("experimentRunMetadata")
         sample_metadata = spreadsheet.worksheet("sampleMetadata")
 
-        # Part 1: Remove bioinformatics fields
-        print(f"Removing bioinformatics fields... (1/{total_steps})")
+        # Part 1: Remove bioinformatics fields and add NOAA fields; both happen per sheet in the workers below
+        print(f"Removing bioinformatics fields and adding NOAA fields to metadata sheets... (1/{total_steps})")
         bioinfo_fields = get_bioinformatics_fields(noaa_checklist_path)
-        remove_bioinfo_fields_from_project_metadata(project_metadata, bioinfo_fields)
-        remove_bioinfo_fields_from_experiment_metadata(experiment_metadata, bioinfo_fields)
-
-        # Part 2: Add NOAA fields to sheets
-        print(f"Adding NOAA fields to metadata sheets... (2/{total_steps})")
         noaa_project_fields = get_noaa_fields(noaa_checklist_path, "NOAAprojectMetadata")
-        add_noaa_fields_to_project_metadata(project_metadata, noaa_project_fields)
-
         noaa_sample_fields = get_noaa_fields(noaa_checklist_path, "NOAAsampleMetadata")
-        add_noaa_fields_to_sample_metadata(sample_metadata, noaa_sample_fields)
-
         noaa_experiment_fields = get_noaa_fields(noaa_checklist_path, "NOAAexperimentRunMetadata")
-        add_noaa_fields_to_experiment_metadata(experiment_metadata, noaa_experiment_fields)
-
-        # NOAA-specific denylist: remove unwanted sampleMetadata terms
-        # assay_name is not needed in sampleMetadata for NOAA FAIRe sheets
-        remove_terms_from_sample_metadata(
-            sample_metadata,
-            terms_to_remove=['assay_name']
-        )
-
-        # NOAA-specific denylist: remove unwanted experimentRunMetadata terms if present
-        remove_terms_from_experiment_metadata(
-            experiment_metadata,
-            terms_to_remove=[
-                'output_read_count',
-                'output_otu_num',
-                'otu_num_tax_assigned'
+
+        def update_project_metadata():
+            remove_bioinfo_fields_from_project_metadata(project_metadata, bioinfo_fields)
+            add_noaa_fields_to_project_metadata(project_metadata, noaa_project_fields)
+
+        def update_sample_metadata():
+            add_noaa_fields_to_sample_metadata(sample_metadata, noaa_sample_fields)
+
+            # NOAA-specific denylist: remove unwanted sampleMetadata terms
+            # assay_name is not needed in sampleMetadata for NOAA FAIRe sheets
+            remove_terms_from_sample_metadata(
+                sample_metadata,
+                terms_to_remove=['assay_name']
+            )
+
+        def update_experiment_metadata():
+            remove_bioinfo_fields_from_experiment_metadata(experiment_metadata, bioinfo_fields)
+            add_noaa_fields_to_experiment_metadata(experiment_metadata, noaa_experiment_fields)
+
+            # NOAA-specific denylist: remove unwanted experimentRunMetadata terms if present
+            remove_terms_from_experiment_metadata(
+                experiment_metadata,
+                terms_to_remove=[
+                    'output_read_count',
+                    'output_otu_num',
+                    'otu_num_tax_assigned'
+                ]
+            )
+
+        # Each metadata sheet is independent, so run the three network-bound updates concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(update_project_metadata),
+                executor.submit(update_sample_metadata),
+                executor.submit(update_experiment_metadata)
             ]
-        )
+            for future in futures:
+                future.result()
 
-        # Part 3: Remove taxa sheets
-        print(f"Removing taxa sheets... (3/{total_steps})")
+        # Part 2: Remove taxa sheets
+        print(f"Removing taxa sheets... (2/{total_steps})")
         remove_taxa_sheets(spreadsheet)
 
-        # Part 4: Create analysisMetadata sheets
-        print(f"Creating analysis metadata sheets... (4/{total_steps})")
-        analysis_worksheets = create_analysis_metadata_sheets(spreadsheet, config)
-
-        # Part 5: Add NOAA analysis metadata fields
-        print(f"Adding NOAA analysis metadata fields... (5/{total_steps})")
+        # Part 3: Create analysisMetadata sheets
+        print(f"Creating analysis metadata sheets... (3/{total_steps})")
         noaa_analysis_fields = get_noaa_fields(noaa_checklist_path, "NOAAanalysisMetadata")
-        for analysis_run_name, worksheet in analysis_worksheets.items():
-            add_noaa_fields_to_analysis_metadata(worksheet, noaa_analysis_fields, config, analysis_run_name)
-        update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config)
+        analysis_worksheets = create_analysis_metadata_sheets(spreadsheet, config, noaa_analysis_fields)
+
+        # Part 4: Add NOAA analysis metadata fields
+        print(f"Adding NOAA analysis metadata fields... (4/{total_steps})")
+        # Each analysisMetadata sheet is independent, so fill them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(add_noaa_fields_to_analysis_metadata, worksheet, noaa_analysis_fields, config, analysis_run_name)
+                for analysis_run_name, worksheet in analysis_worksheets.items()
+            ]
+            for future in futures:
+                future.result()
+        
+        # The sheet list is final from here on, so one metadata read serves the README and dropdown updates
+        worksheets = spreadsheet.worksheets()
+        update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config, worksheets)
         
-        # Part 6: Update dropdown values with NOAA-specific vocabulary
-        print(f"Updating dropdown values with NOAA vocabulary... (6/{total_steps})")
-        update_noaa_vocab_dropdowns(spreadsheet, noaa_checklist_path)
+        # Part 5: Update dropdown values with NOAA-specific vocabulary
+        print(f"Updating dropdown values with NOAA vocabulary... (5/{total_steps})")
+        update_noaa_vocab_dropdowns(spreadsheet, noaa_checklist_path, worksheets)
         
-        # Part 7: Rename the spreadsheet
+        # Part 6: Rename the spreadsheet
         if project_id:
-            print(f"Renaming spreadsheet... (7/{total_steps})")
+            print(f"Renaming spreadsheet... (6/{total_steps})")
             new_title = f"FAIRe-NOAA_{project_id}"
             retry_on_429(lambda: spreadsheet.update_title(new_title))
         else:
@@ -42,6 +42,29 @@ from src.helpers.sample_metadata_sheet import create_sample_metadata_sheet
 from src.helpers.experiment_metadata_sheet import create_experiment_metadata_sheet
 from src.helpers.taxa_sheets import create_taxa_sheets
 from src.helpers.targeted_sheets import create_targeted_sheets
+from src.helpers.template_loader import read_template_sheet
+
+# Colors for requirement levels - matching the R script exactly.
+# Built once at import time; the CellFormat objects are only read by the helpers.
+_REQ_LEVEL_COLORS = {
+    'M': "#E26B0A",
+    'HR': "#FFCC00",
+    'R': "#FFFF99",
+    'O': "#CCFF99",
+}
+_COLOR_STYLES = {
+    level: gsf.CellFormat(backgroundColor=gsf.Color.fromHex(hex_col))
+    for level, hex_col in _REQ_LEVEL_COLORS.items()
+}
+# Same colors as Sheets API color dicts, for helpers that build batchUpdate requests
+_COLOR_RGB = {
+    level: {
+        "red": int(hex_col[1:3], 16) / 255.0,
+        "green": int(hex_col[3:5], 16) / 255.0,
+        "blue": int(hex_col[5:7], 16) / 255.0,
+    }
+    for level, hex_col in _REQ_LEVEL_COLORS.items()
+}
 
 def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
                 sample_type=None, 
@@ -173,23 +196,11 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
         
     try:
         # Read Excel file using pandas instead of openpyxl directly
-        full_template_df = pd.read_excel(full_temp_file_path, sheet_name=None, engine='openpyxl')
+        full_template_df = read_template_sheet(full_temp_file_path, None)
     except Exception as e:
         raise Exception(f"Error reading Excel file with pandas: {e}")
     
-    # Colors for requirement levels - matching the R script exactly
-    req_col_df = pd.DataFrame({
-        'requirement_level': ["M = Mandatory", "HR = Highly recommended", "R = Recommended", "O = Optional"],
-        'requirement_level_code': ["M", "HR", "R", "O"],
-        'col': ["#E26B0A", "#FFCC00", "#FFFF99", "#CCFF99"]
-    })
-    
-    # Define color styles
-    color_styles = {}
-    for _, row in req_col_df.iterrows():
-        color_styles[row['requirement_level_code']] = gsf.CellFormat(
-            backgroundColor=gsf.Color.fromHex(row['col'])
-        )
+    color_styles = _COLOR_STYLES
     
     # Create or clear sheets
     # First create a list of all sheets we'll need (excluding README which will use Sheet1)
@@ -235,6 +246,11 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
         # If Sheet1 doesn't exist for some reason, create README sheet
         worksheets["README"] = spreadsheet.add_worksheet(title="README", rows=200, cols=100)
     
+    # Sheet order after setup: surviving sheets (Sheet1 now README) followed by the new ones,
+    # so the README can list them without reading the spreadsheet again
+    sheet_titles = ["README" if title == "Sheet1" else title
+                    for title in existing_sheets if title not in sheet_names] + sheet_names
+    
     # Update progress bar for setup
     if TQDM_AVAILABLE:
         pbar.update(1)
@@ -258,7 +274,8 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
         sampleMetadata_user=sampleMetadata_user,
         experimentRunMetadata_user=experimentRunMetadata_user,
         color_styles=color_styles,
-        FAIRe_checklist_ver=FAIRe_checklist_ver
+        FAIRe_checklist_ver=FAIRe_checklist_ver,
+        sheet_titles=sheet_titles
     )
     
     # Update progress bar for README
@@ -269,7 +286,7 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
         print("README sheet created (2/{})".format(len(operations)))
     
     # Read vocabulary data from the full template
-    vocab_df = pd.read_excel(full_temp_file_path, sheet_name='Drop-down values')
+    vocab_df = read_template_sheet(full_temp_file_path, 'Drop-down values')
     
     # Create Drop-down values sheet
     if TQDM_AVAILABLE:
@@ -329,7 +346,7 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
         assay_type=assay_type,
         assay_name=assay_name,
         sampleMetadata_user=sampleMetadata_user,
-        color_styles=color_styles,
+        color_styles=_COLOR_RGB,
         vocab_df=vocab_df
     )
     
@@ -352,7 +369,7 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
             full_temp_file_name=full_temp_file_path,
             input_df=input_df,
             req_lev=req_lev,
-            color_styles=color_styles,
+            color_styles=_COLOR_RGB,
             vocab_df=vocab_df,
             experimentRunMetadata_user=experimentRunMetadata_user
         )
@@ -378,7 +395,7 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
                 full_temp_file_name=full_temp_file_path,
                 input_df=input_df,
                 req_lev=req_lev,
-                color_styles=color_styles,
+                color_styles=_COLOR_RGB,
                 vocab_df=vocab_df
             )
             
@@ -409,7 +426,7 @@ def FAIReSheets(req_lev=['M', 'HR', 'R', 'O'],
             full_template_df=full_template_df,  # Pass the pre-loaded DataFrame dictionary
             input_df=input_df,
             req_lev=req_lev,
-            color_styles=color_styles,
+            color_styles=_COLOR_RGB,
             vocab_df=vocab_df,
             project_id=project_id,
             assay_name=assay_name
@@ -6,11 +6,150 @@ import pandas as pd
 import gspread
 import time
 import os
+import re
+import hashlib
 import numpy as np
-import gspread_formatting as gsf
 import webbrowser
+from pathlib import Path
+from functools import lru_cache
+from itertools import groupby
 
-from src.helpers.api_retry import retry_on_429, batch_update_with_retry
+from src.helpers.api_retry import retry_on_429, batch_update_with_retry, WRITE_RATE_LIMITER
+
+# Background colors for requirement level codes, as Sheets API RGB floats
+_COLOR_STYLES = {
+    "M": {"red": 0.89, "green": 0.42, "blue": 0.04},  # #E26B0A - Orange
+    "HR": {"red": 1.0, "green": 0.8, "blue": 0.0},    # #FFCC00 - Yellow
+    "R": {"red": 1.0, "green": 1.0, "blue": 0.6},     # #FFFF99 - Light yellow
+    "O": {"red": 0.8, "green": 1.0, "blue": 0.6}      # #CCFF99 - Light green
+}
+
+# file:// URL of the next steps page shipped alongside this module
+_NEXT_STEPS_URL = Path(__file__).resolve().parent.joinpath('next_steps.html').as_uri()
+_next_steps_shown = False
+
+# Columns of every analysisMetadata sheet
+_ANALYSIS_HEADERS = ['requirement_level_code', 'section', 'term_name', 'values']
+
+# Checklist columns used by the NOAA helpers; everything else is skipped when parsing
+_CHECKLIST_COLUMNS = [
+    'term_name', 'section', 'data_type', 'requirement_level_code',
+    'description', 'controlled_vocabulary', 'controlled_vocabulary_options'
+]
+
+def _checklist_cache_path(path):
+    """
+    Path of the Parquet copy of a checklist workbook, or None if caching is disabled.
+    
+    The name is keyed on the workbook contents and the columns read, so an edited
+    checklist (or a change to _CHECKLIST_COLUMNS) never picks up a stale copy.
+    Set FAIRE_NO_CACHE=1 to always parse the workbook.
+    """
+    if os.environ.get('FAIRE_NO_CACHE'):
+        return None
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    digest.update('|'.join(_CHECKLIST_COLUMNS).encode())
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), '.cache', f"{stem}.{digest.hexdigest()[:12]}.parquet")
+
+@lru_cache(maxsize=None)
+def _load_checklist(path, mtime):
+    """
+    Parse the NOAA checklist sheet. Cached per (path, mtime) so one run reads the
+    workbook once; the returned DataFrame is shared, so callers must not modify it.
+    
+    Across runs, the parsed sheet is kept as Parquet next to the workbook when pyarrow
+    is available, which loads far faster than re-parsing the XLSX.
+    """
+    checklist_df = None
+    cache_path = _checklist_cache_path(path)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            checklist_df = pd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            pass  # No Parquet engine or unreadable copy, so fall back to the workbook
+    
+    if checklist_df is None:
+        try:
+            # calamine is much faster than openpyxl, but needs python-calamine and pandas >= 2.2
+            checklist_df = pd.read_excel(path, sheet_name='checklist', engine='calamine',
+                                         usecols=lambda c: c in _CHECKLIST_COLUMNS, dtype=str)
+        except (ImportError, ValueError):
+            checklist_df = pd.read_excel(path, sheet_name='checklist', engine='openpyxl',
+                                         usecols=lambda c: c in _CHECKLIST_COLUMNS, dtype=str)
+        
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                checklist_df.to_parquet(cache_path, index=False)
+            except (ImportError, OSError, ValueError):
+                pass  # Caching is best effort
+    
+    # Parse every term's controlled vocabulary once per load, so callers never re-split it
+    return checklist_df.assign(_cv_values=_split_cv_options(checklist_df))
+
+def _read_checklist(noaa_checklist_path):
+    """
+    Return the (cached) NOAA checklist DataFrame for the given path.
+    """
+    path = os.path.abspath(noaa_checklist_path)
+    return _load_checklist(path, os.path.getmtime(path))
+
+def _delete_dimension_requests(sheet_id, dimension, indices):
+    """
+    Build deleteDimension requests for the given 1-based row or column indices.
+    
+    Consecutive indices are merged into one range, and the ranges are emitted from
+    last to first so earlier deletes don't shift the ones that follow.
+    """
+    runs = []
+    for _, run in groupby(enumerate(sorted(set(indices))), key=lambda r: r[1] - r[0]):
+        run = list(run)
+        runs.append((run[0][1], run[-1][1]))
+    
+    return [{
+        "deleteDimension": {
+            "range": {
+                "sheetId": sheet_id,
+                "dimension": dimension,
+                "startIndex": start - 1,  # Convert to 0-based
+                "endIndex": end
+            }
+        }
+    } for start, end in reversed(runs)]
+
+def _note_requests(sheet_id, notes, *, row=None, col=None):
+    """
+    Build 'note' updateCells requests, one per run of adjacent cells.
+    
+    Args:
+        sheet_id (int): The worksheet's sheetId
+        notes (dict): 0-based index -> note text. Indices are rows when col is given,
+            columns when row is given.
+        row (int, optional): Fixed 0-based row the notes run along
+        col (int, optional): Fixed 0-based column the notes run down
+    """
+    requests = []
+    for _, run in groupby(enumerate(sorted(notes)), key=lambda r: r[1] - r[0]):
+        indices = [idx for _, idx in run]
+        if col is not None:
+            cell_range = {"startRowIndex": indices[0], "endRowIndex": indices[-1] + 1,
+                          "startColumnIndex": col, "endColumnIndex": col + 1}
+            rows = [{"values": [{"note": notes[idx]}]} for idx in indices]
+        else:
+            cell_range = {"startRowIndex": row, "endRowIndex": row + 1,
+                          "startColumnIndex": indices[0], "endColumnIndex": indices[-1] + 1}
+            rows = [{"values": [{"note": notes[idx]} for idx in indices]}]
+        requests.append({
+            "updateCells": {
+                "range": {"sheetId": sheet_id, **cell_range},
+                "rows": rows,
+                "fields": "note"
+            }
+        })
+    return requests
 
 def get_bioinformatics_fields(noaa_checklist_path):
     """
@@ -24,7 +163,7 @@ def get_bioinformatics_fields(noaa_checklist_path):
     """
     try:
         # Read the checklist sheet
-        input_df = pd.read_excel(noaa_checklist_path, sheet_name='checklist')
+        input_df = _read_checklist(noaa_checklist_path)
         
         # Get all fields where section is 'Bioinformatics' (lowercase column name)
         bioinfo_fields = input_df[input_df['section'] == 'Bioinformatics']['term_name'].tolist()
@@ -42,117 +181,81 @@ def remove_bioinfo_fields_from_project_metadata(worksheet, bioinfo_fields):
         bioinfo_fields (list): List of term names to remove
     """
     try:
-        # Get all data from the worksheet
-        data = worksheet.get_all_values()
-        if not data:
+        if not bioinfo_fields:
             return
             
-        # Find the term_name column index
-        headers = data[0]
+        # Read only the header row first instead of the whole sheet
+        headers = worksheet.row_values(1)
+        if not headers:
+            return
+            
+        # Map header names to column indices once
+        col_idx = {h: i for i, h in enumerate(headers)}
         
-        term_name_col = headers.index('term_name')
+        term_name_col = col_idx['term_name']
         
         # Find the project_level column index (this is where dropdowns go)
-        project_level_col = None
-        for i, header in enumerate(headers):
-            if header == 'project_level':
-                project_level_col = i
-                break
+        project_level_col = col_idx.get('project_level')
                 
         if project_level_col is None:
             return
             
+        # Fetch just the term_name column to find the rows to delete
+        term_names = worksheet.col_values(term_name_col + 1)
+        
         # Find rows to delete (1-based indexing for worksheet operations)
-        rows_to_delete = []
-        for i, row in enumerate(data[1:], start=2):  # Start from 2 to skip header
-            if row[term_name_col] in bioinfo_fields:
-                rows_to_delete.append(i)
+        bioinfo_set = frozenset(bioinfo_fields)
+        is_bioinfo = pd.Series(term_names[1:], dtype=object).isin(bioinfo_set).to_numpy()
+        rows_to_delete = (np.flatnonzero(is_bioinfo) + 2).tolist()  # +2 skips the header row
         
-        # Prepare batch delete request for rows
-        batch_requests = []
-        for row_idx in sorted(rows_to_delete, reverse=True):
-            batch_requests.append({
-                "deleteDimension": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "dimension": "ROWS",
-                        "startIndex": row_idx - 1,  # Convert to 0-based
-                        "endIndex": row_idx
-                    }
-                }
-            })
+        if not rows_to_delete:
+            return
+            
+        # Prepare batch delete requests, one per run of adjacent rows
+        batch_requests = _delete_dimension_requests(worksheet.id, "ROWS", rows_to_delete)
         
         # Execute batch delete
         if batch_requests:
-            try:
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            except gspread.exceptions.APIError as e:
-                if "429" in str(e):  # Rate limit error
-                    time.sleep(60)
-                    worksheet.spreadsheet.batch_update({'requests': batch_requests})
-                else:
-                    raise
+            batch_update_with_retry(worksheet.spreadsheet, batch_requests)
         
         # Now we need to restore the dropdowns
-        # First, get the updated data after deletion
-        updated_data = worksheet.get_all_values()
+        # The surviving rows are known locally, so no need to re-read the sheet
+        surviving_terms = np.asarray(term_names[1:], dtype=object)[~is_bioinfo].tolist()
         
         # Use the NOAA checklist for vocabulary data
-        import os
-        import pandas as pd
-        
         noaa_checklist_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
                                          'input', 'FAIRe_NOAA_checklist_v1.0.2.xlsx')
         
         # Read the checklist sheet
-        checklist_df = pd.read_excel(noaa_checklist_path, sheet_name='checklist')
+        checklist_df = _read_checklist(noaa_checklist_path)
         
-        # Prepare batch validation requests
-        validation_requests = []
+        # Parse every term's controlled vocabulary once, then look each surviving row up
+        vocab_by_term = _vocab_by_term(checklist_df)
         
-        # For each row in the updated sheet
-        for i, row in enumerate(updated_data[1:], start=2):  # Skip header row
-            term_name = row[term_name_col]
-            
-            # Find this term in the checklist dataframe
-            term_row = checklist_df[checklist_df['term_name'] == term_name]
-            if not term_row.empty and 'controlled_vocabulary_options' in term_row.columns:
-                vocab_str = term_row.iloc[0]['controlled_vocabulary_options']
-                if pd.notna(vocab_str) and vocab_str:
-                    # Split the controlled vocabulary string by pipe character
-                    values = [v.strip() for v in str(vocab_str).split('|')]
-                    
-                    if values:
-                        # Add data validation for this cell
-                        validation_requests.append({
-                            "setDataValidation": {
-                                "range": {
-                                    "sheetId": worksheet.id,
-                                    "startRowIndex": i - 1,  # 0-based
-                                    "endRowIndex": i,
-                                    "startColumnIndex": project_level_col,
-                                    "endColumnIndex": project_level_col + 1
-                                },
-                                "rule": {
-                                    "condition": {
-                                        "type": "ONE_OF_LIST",
-                                        "values": [{"userEnteredValue": v} for v in values]
-                                    },
-                                    "showCustomUi": True
-                                }
-                            }
-                        })
+        # The k-th survivor now sits at sheet row k + 1
+        row_values = [tuple(vocab_by_term.get(term_name, ())) for term_name in surviving_terms]
+        
+        # Prepare batch validation requests, one per run of adjacent rows sharing the same options
+        validation_requests = []
+        for values, run in groupby(enumerate(row_values, start=2), key=lambda r: r[1]):  # Skip header row
+            if values:
+                run = list(run)
+                validation_requests.append({
+                    "setDataValidation": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": run[0][0] - 1,  # 0-based
+                            "endRowIndex": run[-1][0],
+                            "startColumnIndex": project_level_col,
+                            "endColumnIndex": project_level_col + 1
+                        },
+                        "rule": _dropdown_rule(tuple(values))
+                    }
+                })
         
         # Execute batch validation update
         if validation_requests:
-            try:
-                worksheet.spreadsheet.batch_update({"requests": validation_requests})
-            except gspread.exceptions.APIError as e:
-                if "429" in str(e):  # Rate limit error
-                    time.sleep(60)
-                    worksheet.spreadsheet.batch_update({"requests": validation_requests})
-                else:
-                    raise
+            batch_update_with_retry(worksheet.spreadsheet, validation_requests)
     except Exception as e:
         raise Exception(f"Error removing bioinformatics fields from projectMetadata: {e}") 
 
@@ -165,45 +268,28 @@ def remove_bioinfo_fields_from_experiment_metadata(worksheet, bioinfo_fields):
         bioinfo_fields (list): List of term names to remove
     """
     try:
-        # Get all data from the worksheet
-        data = worksheet.get_all_values()
-        if not data:
+        if not bioinfo_fields:
+            return
+            
+        # Row 3 contains term names; fetch only that row instead of the whole sheet
+        term_names = worksheet.row_values(3)
+        if not term_names:
             return
             
         # Find columns to delete (1-based indexing for worksheet operations)
-        cols_to_delete = []
-        for i, term in enumerate(data[2]):  # Row 3 (index 2) contains term names
-            if term in bioinfo_fields:
-                cols_to_delete.append(i + 1)  # Convert to 1-based column index
+        is_bioinfo = pd.Series(term_names, dtype=object).isin(frozenset(bioinfo_fields)).to_numpy()
+        cols_to_delete = (np.flatnonzero(is_bioinfo) + 1).tolist()  # Convert to 1-based column index
         
         if not cols_to_delete:
             return
             
-        # Prepare batch delete request
-        # Note: We need to delete from right to left to maintain correct indices
-        batch_requests = []
-        for col_idx in sorted(cols_to_delete, reverse=True):
-            batch_requests.append({
-                "deleteDimension": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "dimension": "COLUMNS",
-                        "startIndex": col_idx - 1,  # Convert to 0-based
-                        "endIndex": col_idx
-                    }
-                }
-            })
+        # Prepare batch delete requests, one per run of adjacent columns
+        # Note: the runs are deleted from right to left to maintain correct indices
+        batch_requests = _delete_dimension_requests(worksheet.id, "COLUMNS", cols_to_delete)
         
         # Execute batch delete
         if batch_requests:
-            try:
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            except gspread.exceptions.APIError as e:
-                if "429" in str(e):  # Rate limit error
-                    time.sleep(60)
-                    worksheet.spreadsheet.batch_update({'requests': batch_requests})
-                else:
-                    raise
+            batch_update_with_retry(worksheet.spreadsheet, batch_requests)
                     
     except Exception as e:
         raise Exception(f"Error removing bioinformatics fields from experimentRunMetadata: {e}") 
@@ -238,27 +324,9 @@ def remove_terms_from_experiment_metadata(worksheet, terms_to_remove):
                 cols_to_delete.append(i + 1)  # 1-based for Sheets API
         if not cols_to_delete:
             return
-        # Prepare batch delete requests from right to left
-        batch_requests = []
-        for col_idx in sorted(cols_to_delete, reverse=True):
-            batch_requests.append({
-                "deleteDimension": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "dimension": "COLUMNS",
-                        "startIndex": col_idx - 1,  # 0-based
-                        "endIndex": col_idx
-                    }
-                }
-            })
-        try:
-            worksheet.spreadsheet.batch_update({'requests': batch_requests})
-        except gspread.exceptions.APIError as e:
-            if "429" in str(e):  # Rate limit error
-                time.sleep(60)
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            else:
-                raise
+        # Prepare batch delete requests from right to left, one per run of adjacent columns
+        batch_requests = _delete_dimension_requests(worksheet.id, "COLUMNS", cols_to_delete)
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
     except Exception as e:
         raise Exception(f"Error removing specified terms from experimentRunMetadata: {e}")
 
@@ -297,32 +365,48 @@ def remove_terms_from_sample_metadata(worksheet, terms_to_remove):
                 cols_to_delete.append(i + 1)  # 1-based for Sheets API
         if not cols_to_delete:
             return
-        # Prepare batch delete requests from right to left
-        batch_requests = []
-        for col_idx in sorted(cols_to_delete, reverse=True):
-            batch_requests.append({
-                "deleteDimension": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "dimension": "COLUMNS",
-                        "startIndex": col_idx - 1,  # 0-based
-                        "endIndex": col_idx
-                    }
-                }
-            })
-        try:
-            worksheet.spreadsheet.batch_update({'requests': batch_requests})
-        except gspread.exceptions.APIError as e:
-            if "429" in str(e):  # Rate limit error
-                time.sleep(60)
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            else:
-                raise
+        # Prepare batch delete requests from right to left, one per run of adjacent columns
+        batch_requests = _delete_dimension_requests(worksheet.id, "COLUMNS", cols_to_delete)
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
     except Exception as e:
         raise Exception(f"Error removing specified terms from sampleMetadata: {e}")
 
 # Part 2: Add NOAA fields to the sheets
 
+def _split_cv_options(checklist_df):
+    """
+    Split each row's pipe-delimited controlled_vocabulary_options into a list of its
+    non-empty options; rows without a vocabulary get an empty list.
+    """
+    if 'controlled_vocabulary_options' not in checklist_df.columns:
+        return [[] for _ in range(len(checklist_df))]
+    split = checklist_df['controlled_vocabulary_options'].str.split('|')
+    return [[v.strip() for v in options if v.strip()] if isinstance(options, list) else [] for options in split]
+
+
+@lru_cache(maxsize=None)
+def _dropdown_rule(values):
+    """
+    Build the ONE_OF_LIST validation rule for a tuple of dropdown options.
+    Memoized, so terms sharing a vocabulary reuse one rule object; treat it as read-only.
+    """
+    return {
+        "condition": {
+            "type": "ONE_OF_LIST",
+            "values": [{"userEnteredValue": v} for v in values]
+        },
+        "showCustomUi": True,
+        "strict": False
+    }
+
+
+def _vocab_by_term(checklist_df):
+    """
+    Map each checklist term_name to its parsed controlled vocabulary, skipping terms without one.
+    """
+    return {term: values for term, values in zip(checklist_df['term_name'], checklist_df['_cv_values']) if pd.notna(term) and values}
+
+
 def get_noaa_fields(noaa_checklist_path, sheet_type):
     """
     Get fields from the NOAA checklist that have the specified NOAA prefix in data_type.
@@ -332,17 +416,18 @@ def get_noaa_fields(noaa_checklist_path, sheet_type):
         sheet_type (str): Type of sheet to get fields for (e.g., 'NOAAprojectMetadata')
         
     Returns:
-        pandas.DataFrame: DataFrame containing rows with the specified NOAA prefix
+        pandas.DataFrame: DataFrame containing rows with the specified NOAA prefix, including
+            the '_cv_values' column holding each field's parsed controlled vocabulary list
     """
     try:
         # Read the checklist sheet
-        input_df = pd.read_excel(noaa_checklist_path, sheet_name='checklist')
+        input_df = _read_checklist(noaa_checklist_path)
         
         # Filter rows where data_type contains the specified NOAA prefix
         # This handles cases where multiple values are in the data_type column
         # separated by pipes or other delimiters
-        noaa_fields = input_df[input_df['data_type'].apply(
-            lambda x: isinstance(x, str) and sheet_type in [t.strip() for t in str(x).split('|')]
+        noaa_fields = input_df[input_df['data_type'].str.contains(
+            rf'(?:^|\|)\s*{re.escape(sheet_type)}\s*(?:\||$)', na=False
         )]
         
         return noaa_fields
@@ -359,12 +444,6 @@ def add_noaa_fields_to_project_metadata(worksheet, noaa_fields):
         noaa_fields (pandas.DataFrame): DataFrame containing NOAA fields to add
     """
     try:
-        import pandas as pd
-        import gspread
-        import gspread_formatting as gsf
-        import numpy as np
-        import time
-        
         # Replace NaN values with empty strings
         noaa_fields = noaa_fields.fillna('')
         
@@ -373,172 +452,142 @@ def add_noaa_fields_to_project_metadata(worksheet, noaa_fields):
         if not data:
             return
             
-        # Find the term_name column index
+        # Map header names to column indices once
         headers = data[0]
+        col_idx = {h: i for i, h in enumerate(headers)}
         
-        # Convert data to DataFrame for easier manipulation
-        sheet_df = pd.DataFrame(data[1:], columns=headers)
-        
-        # Prepare new rows to add
-        new_rows = []
-        for _, row in noaa_fields.iterrows():
-            new_row = {}
-            for col in headers:
-                new_row[col] = ''
-            
-            # Fill in the values we have
-            new_row['term_name'] = row['term_name']
-            new_row['requirement_level_code'] = row['requirement_level_code']
-            new_row['section'] = row['section']
-            
-            # Add to new rows
-            new_rows.append(new_row)
+        # Build the new rows directly as lists aligned to the headers and append them
+        new_rows = np.full((len(noaa_fields), len(headers)), '', dtype=object)
+        for col in ('term_name', 'requirement_level_code', 'section'):
+            new_rows[:, col_idx[col]] = noaa_fields[col].to_numpy()
         
-        # Convert to DataFrame and append to existing data
-        new_rows_df = pd.DataFrame(new_rows)
-        updated_df = pd.concat([sheet_df, new_rows_df], ignore_index=True)
+        updated_data = data + new_rows.tolist()
         
-        # Replace any NaN values with empty strings
-        updated_df = updated_df.fillna('')
-        
-        # Convert back to list of lists for updating the sheet
-        updated_data = [headers] + updated_df.values.tolist()
+        # Format cells based on requirement level
+        req_level_col = col_idx['requirement_level_code']
+        term_name_col = col_idx['term_name']
+        project_level_col = col_idx['project_level']
         
-        # Update the worksheet with all data at once
-        worksheet.resize(rows=len(updated_data) + 10, cols=len(headers) + 5)  # Add buffer
-        worksheet.update("A1", updated_data)
+        # Prepare a single batch request for resize, data, formatting, notes and validation
+        total_rows = len(updated_data) + 10  # Add buffer
+        batch_requests = []
         
-        # Define color styles for requirement levels
-        color_styles = {
-            "M": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#E26B0A")),  # Mandatory - Orange
-            "HR": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFCC00")), # Highly recommended - Yellow
-            "R": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFFF99")),  # Recommended - Light yellow
-            "O": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#CCFF99"))   # Optional - Light green
-        }
+        # 1. Resize the worksheet
+        batch_requests.append({
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": worksheet.id,
+                    "gridProperties": {
+                        "rowCount": total_rows,
+                        "columnCount": len(headers) + 5   # Add buffer
+                    }
+                },
+                "fields": "gridProperties(rowCount,columnCount)"
+            }
+        })
         
-        # Format cells based on requirement level
-        req_level_col = headers.index('requirement_level_code')
-        term_name_col = headers.index('term_name')
-        project_level_col = headers.index('project_level')
+        # 2. Write only the appended rows; the existing rows are already on the sheet
+        first_new_row = len(data)
+        batch_requests.append({
+            "updateCells": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": first_new_row,
+                    "endRowIndex": len(updated_data),
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(headers)
+                },
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]} for row in updated_data[first_new_row:]],
+                "fields": "userEnteredValue"
+            }
+        })
         
-        # Batch requests for formatting
-        batch_requests = []
+        # 3. Apply formatting, one request per run of adjacent rows instead of per row
+        req_levels = [row[req_level_col] if req_level_col < len(row) else '' for row in updated_data[1:]]
         
-        # Apply formatting to new rows
-        for i, row in enumerate(updated_data[1:], start=1):
-            # Skip if no requirement level
-            if req_level_col >= len(row) or not row[req_level_col]:
-                continue
-                
-            req_level = row[req_level_col]
-            if req_level in color_styles:
-                # Add color formatting for requirement level
+        # Add color formatting for requirement level
+        for req_level, run in groupby(enumerate(req_levels, start=1), key=lambda r: r[1]):
+            if req_level in _COLOR_STYLES:
+                run = list(run)
                 batch_requests.append({
                     "repeatCell": {
                         "range": {
                             "sheetId": worksheet.id,
-                            "startRowIndex": i,
-                            "endRowIndex": i + 1,
+                            "startRowIndex": run[0][0],
+                            "endRowIndex": run[-1][0] + 1,
                             "startColumnIndex": req_level_col,
                             "endColumnIndex": req_level_col + 1
                         },
                         "cell": {
                             "userEnteredFormat": {
-                                "backgroundColor": {
-                                    "red": color_styles[req_level].backgroundColor.red,
-                                    "green": color_styles[req_level].backgroundColor.green,
-                                    "blue": color_styles[req_level].backgroundColor.blue
-                                }
+                                "backgroundColor": _COLOR_STYLES[req_level]
                             }
                         },
                         "fields": "userEnteredFormat.backgroundColor"
                     }
                 })
-                
-            # Bold the term name
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "startRowIndex": i,
-                        "endRowIndex": i + 1,
-                        "startColumnIndex": term_name_col,
-                        "endColumnIndex": term_name_col + 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
+        
+        # Bold the term name of every row that has a requirement level
+        for has_level, run in groupby(enumerate(req_levels, start=1), key=lambda r: bool(r[1])):
+            if has_level:
+                run = list(run)
+                batch_requests.append({
+                    "repeatCell": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": run[0][0],
+                            "endRowIndex": run[-1][0] + 1,
+                            "startColumnIndex": term_name_col,
+                            "endColumnIndex": term_name_col + 1
+                        },
+                        "cell": {
+                            "userEnteredFormat": {
+                                "textFormat": {
+                                    "bold": True
+                                }
                             }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
+                        },
+                        "fields": "userEnteredFormat.textFormat.bold"
+                    }
+                })
         
-        # Apply batch formatting
-        if batch_requests:
-            worksheet.spreadsheet.batch_update({"requests": batch_requests})
-            
-        # Add descriptions as notes and controlled vocabulary dropdowns
-        note_requests = []
+        # 4. Add descriptions as notes and controlled vocabulary dropdowns
+        notes = {}  # Row index -> description, sent as one updateCells per run of rows
         validation_requests = []
         clear_validation_requests = []
         
         # Number of value columns (project_level + any assay columns)
         num_value_cols = len(headers) - project_level_col
         
+        # Plain dict of term name -> field info, so each row is a hash lookup (first entry wins)
+        info_lookup = noaa_fields.drop_duplicates('term_name').set_index('term_name').to_dict(orient='index')
+        
         for i, row in enumerate(updated_data[1:], start=1):
             term_name = row[term_name_col]
-            term_info = noaa_fields[noaa_fields['term_name'] == term_name]
+            term_info = info_lookup.get(term_name)
             
-            if not term_info.empty:
-                # Add description as note
-                description = term_info.iloc[0]['description'] if 'description' in term_info.columns else ''
+            if term_info is not None:
+                # Collect description as note
+                description = term_info.get('description', '')
                 if description:
-                    note_requests.append({
-                        "updateCells": {
+                    notes[i] = description
+                
+                # Check if this field has controlled vocabulary
+                values = term_info['_cv_values']
+                if values:
+                    # Add controlled vocabulary dropdown to ALL value columns
+                    validation_requests.append({
+                        "setDataValidation": {
                             "range": {
                                 "sheetId": worksheet.id,
                                 "startRowIndex": i,
                                 "endRowIndex": i + 1,
-                                "startColumnIndex": term_name_col,
-                                "endColumnIndex": term_name_col + 1
+                                "startColumnIndex": project_level_col,
+                                "endColumnIndex": len(headers)  # All value columns
                             },
-                            "rows": [{
-                                "values": [{
-                                    "note": description
-                                }]
-                            }],
-                            "fields": "note"
+                            "rule": _dropdown_rule(tuple(values))
                         }
                     })
-                
-                # Check if this field has controlled vocabulary
-                cv_options = term_info.iloc[0]['controlled_vocabulary_options'] if 'controlled_vocabulary_options' in term_info.columns else ''
-                if pd.notna(cv_options) and cv_options:
-                    values = [v.strip() for v in str(cv_options).split('|') if v.strip()]
-                    if values:
-                        # Add controlled vocabulary dropdown to ALL value columns
-                        validation_requests.append({
-                            "setDataValidation": {
-                                "range": {
-                                    "sheetId": worksheet.id,
-                                    "startRowIndex": i,
-                                    "endRowIndex": i + 1,
-                                    "startColumnIndex": project_level_col,
-                                    "endColumnIndex": len(headers)  # All value columns
-                                },
-                                "rule": {
-                                    "condition": {
-                                        "type": "ONE_OF_LIST",
-                                        "values": [{"userEnteredValue": v} for v in values]
-                                    },
-                                    "showCustomUi": True,
-                                    "strict": False
-                                }
-                            }
-                        })
                 else:
                     # No controlled vocabulary - clear any existing dropdown validation
                     # Clear from ALL value columns (project_level + assay columns)
@@ -555,32 +604,18 @@ def add_noaa_fields_to_project_metadata(worksheet, noaa_fields):
                         }
                     })
         
-        # Apply notes
-        if note_requests:
-            worksheet.spreadsheet.batch_update({"requests": note_requests})
-        
-        # Clear validation for fields without controlled vocabulary (do this first)
-        if clear_validation_requests:
-            worksheet.spreadsheet.batch_update({"requests": clear_validation_requests})
-        
-        # Apply data validation for fields with controlled vocabulary
-        if validation_requests:
-            worksheet.spreadsheet.batch_update({"requests": validation_requests})
-        
         # Clean up phantom dropdowns in empty rows at the bottom of the sheet
-        # Get fresh data to find where actual data ends
-        final_data = worksheet.get_all_values()
+        # The sheet will hold exactly updated_data, so find where actual data ends locally
         last_data_row = 0
-        for i, row in enumerate(final_data):
+        for i, row in enumerate(updated_data):
             # Check if this row has any content in the term_name column
             if i > 0 and term_name_col < len(row) and row[term_name_col].strip():
                 last_data_row = i
         
         # Clear validation from all rows after the last data row
         # This removes phantom dropdowns in empty rows
-        total_rows = worksheet.row_count
         if last_data_row < total_rows - 1:
-            clear_phantom_requests = [{
+            clear_validation_requests.append({
                 "setDataValidation": {
                     "range": {
                         "sheetId": worksheet.id,
@@ -591,13 +626,43 @@ def add_noaa_fields_to_project_metadata(worksheet, noaa_fields):
                     }
                     # No "rule" key means clear validation
                 }
-            }]
-            worksheet.spreadsheet.batch_update({"requests": clear_phantom_requests})
+            })
+        
+        # Notes, then clear stale validation before applying the new dropdowns
+        batch_requests.extend(_note_requests(worksheet.id, notes, col=term_name_col))
+        batch_requests.extend(clear_validation_requests)
+        batch_requests.extend(validation_requests)
+        
+        # Execute all requests in one API call
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
         
     except Exception as e:
         raise Exception(f"Error adding NOAA fields to projectMetadata: {e}")
 
 
+def _find_key_rows(data):
+    """
+    Locate the header rows of a column-oriented sheet (experimentRunMetadata, sampleMetadata).
+    
+    The '# requirement_level_code', '# section' and '# description' labels live in column A
+    above the term names, which are the first row whose label doesn't start with '#'.
+    
+    Returns:
+        tuple: (term_name_row, req_level_row, section_row, description_row), 0-based, None if missing
+    """
+    labels = {}
+    term_name_row = None
+    for idx, row in enumerate(data):
+        label = row[0] if row else ''
+        if label.startswith('#'):
+            labels.setdefault(label, idx)
+        elif label:
+            term_name_row = idx
+            break
+    return (term_name_row, labels.get('# requirement_level_code'),
+            labels.get('# section'), labels.get('# description'))
+
+
 def add_noaa_fields_to_experiment_metadata(worksheet, noaa_fields):
     """
     Add NOAA fields to experimentRunMetadata sheet.
@@ -607,10 +672,10 @@ def add_noaa_fields_to_experiment_metadata(worksheet, noaa_fields):
         noaa_fields (pandas.DataFrame): DataFrame containing NOAA fields to add
     """
     try:
-        import pandas as pd
-        import numpy as np
-        import gspread_formatting as gsf
-        
+        # Nothing to add, so skip the sheet read and writes entirely
+        if noaa_fields.empty:
+            return
+            
         # Replace NaN values with empty strings
         noaa_fields = noaa_fields.fillna('')
         
@@ -620,189 +685,148 @@ def add_noaa_fields_to_experiment_metadata(worksheet, noaa_fields):
             return
             
         # Find key rows
-        term_name_row = None
-        req_level_row = None
-        section_row = None
-        description_row = None
-        
-        for idx, row in enumerate(data):
-            if '# requirement_level_code' in row:
-                req_level_row = idx
-            if '# section' in row:
-                section_row = idx
-            if '# description' in row:
-                description_row = idx
-            # The term name row is typically the last row with actual field names
-            if any(col for col in row if isinstance(col, str) and not col.startswith('#')):
-                term_name_row = idx
+        term_name_row, req_level_row, section_row, description_row = _find_key_rows(data)
         
         if term_name_row is None:
             # Default to row 2 if not found
             term_name_row = 2
             
-        # Convert data to DataFrame for easier manipulation
-        sheet_df = pd.DataFrame(data)
-        
-        # Prepare new columns to add
-        new_cols = []
-        for _, row in noaa_fields.iterrows():
-            # Create a new column for the NOAA field
-            new_col_idx = sheet_df.shape[1]
-            sheet_df[new_col_idx] = ''
-            
-            # Set term name
-            sheet_df.iloc[term_name_row, new_col_idx] = row['term_name']
-            
-            # Set requirement level and section if those rows exist
-            if req_level_row is not None:
-                sheet_df.iloc[req_level_row, new_col_idx] = row['requirement_level_code']
-            if section_row is not None:
-                sheet_df.iloc[section_row, new_col_idx] = row['section']
-            if description_row is not None and 'description' in row and row['description'] != '':
-                sheet_df.iloc[description_row, new_col_idx] = row['description']
-            
-            new_cols.append(new_col_idx)
+        # New columns start right after the widest existing row
+        num_existing_cols = max(len(row) for row in data)
         
-        # Replace any NaN values with empty strings
-        sheet_df = sheet_df.fillna('')
+        # Build all new columns in a single block instead of growing a DataFrame per field
+        new_block = np.full((len(data), len(noaa_fields)), '', dtype=object)
+        new_block[term_name_row, :] = noaa_fields['term_name'].to_numpy()
         
-        # Convert back to list of lists for updating the sheet
-        updated_data = sheet_df.values.tolist()
+        # Set requirement level, section and description if those rows exist
+        if req_level_row is not None:
+            new_block[req_level_row, :] = noaa_fields['requirement_level_code'].to_numpy()
+        if section_row is not None:
+            new_block[section_row, :] = noaa_fields['section'].to_numpy()
+        if description_row is not None and 'description' in noaa_fields.columns:
+            new_block[description_row, :] = noaa_fields['description'].to_numpy()
         
-        # Update the worksheet with all data at once
-        worksheet.resize(rows=len(updated_data) + 10, cols=len(updated_data[0]) + 5)  # Add buffer
-        worksheet.update("A1", updated_data)
+        new_cols = list(range(num_existing_cols, num_existing_cols + len(noaa_fields)))
         
-        # Define color styles for requirement levels
-        color_styles = {
-            "M": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#E26B0A")),  # Mandatory - Orange
-            "HR": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFCC00")), # Highly recommended - Yellow
-            "R": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFFF99")),  # Recommended - Light yellow
-            "O": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#CCFF99"))   # Optional - Light green
-        }
+        # Only the header rows of the new columns carry values
+        used_rows = max(r for r in (term_name_row, req_level_row, section_row, description_row) if r is not None) + 1
         
-        # Format cells based on requirement level
+        # Append and write only the new column block, together with its formatting
         batch_requests = []
         
-        # Apply color formatting to requirement level cells
+        # 1. Grow the grid for the new columns (and a row buffer) without shrinking it
+        missing_cols = num_existing_cols + len(noaa_fields) - worksheet.col_count
+        if missing_cols > 0:
+            batch_requests.append({
+                "appendDimension": {
+                    "sheetId": worksheet.id,
+                    "dimension": "COLUMNS",
+                    "length": missing_cols
+                }
+            })
+        missing_rows = len(data) + 10 - worksheet.row_count  # Add buffer
+        if missing_rows > 0:
+            batch_requests.append({
+                "appendDimension": {
+                    "sheetId": worksheet.id,
+                    "dimension": "ROWS",
+                    "length": missing_rows
+                }
+            })
+        
+        # 2. Write the new columns
+        batch_requests.append({
+            "updateCells": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": used_rows,
+                    "startColumnIndex": num_existing_cols,
+                    "endColumnIndex": num_existing_cols + len(noaa_fields)
+                },
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]} for row in new_block[:used_rows]],
+                "fields": "userEnteredValue"
+            }
+        })
+        
+        # 3. Apply color formatting to requirement level cells, one request per run of equal levels
         if req_level_row is not None:
-            for col_idx in new_cols:
-                req_level = sheet_df.iloc[req_level_row, col_idx]
-                if req_level in color_styles:
+            for req_level, run in groupby(new_cols, key=lambda c: new_block[req_level_row, c - num_existing_cols]):
+                run = list(run)
+                if req_level in _COLOR_STYLES:
                     batch_requests.append({
                         "repeatCell": {
                             "range": {
                                 "sheetId": worksheet.id,
                                 "startRowIndex": req_level_row,
                                 "endRowIndex": req_level_row + 1,
-                                "startColumnIndex": col_idx,
-                                "endColumnIndex": col_idx + 1
+                                "startColumnIndex": run[0],
+                                "endColumnIndex": run[-1] + 1
                             },
                             "cell": {
                                 "userEnteredFormat": {
-                                    "backgroundColor": {
-                                        "red": color_styles[req_level].backgroundColor.red,
-                                        "green": color_styles[req_level].backgroundColor.green,
-                                        "blue": color_styles[req_level].backgroundColor.blue
-                                    }
+                                    "backgroundColor": _COLOR_STYLES[req_level]
                                 }
                             },
                             "fields": "userEnteredFormat.backgroundColor"
                         }
                     })
                     
-        # Bold the term names
-        for col_idx in new_cols:
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": worksheet.id,
-                        "startRowIndex": term_name_row,
-                        "endRowIndex": term_name_row + 1,
-                        "startColumnIndex": col_idx,
-                        "endColumnIndex": col_idx + 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
+        # 4. Bold all new term names at once (new columns are appended contiguously)
+        batch_requests.append({
+            "repeatCell": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": term_name_row,
+                    "endRowIndex": term_name_row + 1,
+                    "startColumnIndex": new_cols[0],
+                    "endColumnIndex": new_cols[-1] + 1
+                },
+                "cell": {
+                    "userEnteredFormat": {
+                        "textFormat": {
+                            "bold": True
+                        }
+                    }
+                },
+                "fields": "userEnteredFormat.textFormat.bold"
+            }
+        })
         
-        # Apply batch formatting
-        if batch_requests:
-            worksheet.spreadsheet.batch_update({"requests": batch_requests})
-            
         # Add notes to term names and controlled vocabulary dropdowns
-        note_requests = []
         validation_requests = []
         
-        for col_idx in new_cols:
-            term_name = sheet_df.iloc[term_name_row, col_idx]
-            term_rows = noaa_fields[noaa_fields['term_name'] == term_name]
-            if not term_rows.empty:
-                term_info = term_rows.iloc[0]
-                
-                # Add description as note
-                if 'description' in term_info and term_info['description']:
-                    note_requests.append({
-                        "updateCells": {
-                            "range": {
-                                "sheetId": worksheet.id,
-                                "startRowIndex": term_name_row,
-                                "endRowIndex": term_name_row + 1,
-                                "startColumnIndex": col_idx,
-                                "endColumnIndex": col_idx + 1
-                            },
-                            "rows": [{
-                                "values": [{
-                                    "note": term_info['description']
-                                }]
-                            }],
-                            "fields": "note"
-                        }
-                    })
-                
-                # Add controlled vocabulary dropdown - FIXED VERSION
-                if 'controlled_vocabulary_options' in term_info and term_info['controlled_vocabulary_options']:
-                    # Parse the controlled vocabulary values
-                    cv_values = [v.strip() for v in str(term_info['controlled_vocabulary_options']).split('|') if v.strip()]
-                    if cv_values:
-                        # Remove the debug print that was interrupting the progress bar
-                        # print(f"Adding dropdown for {term_name} with values: {cv_values}")
-                        
-                        # Apply to all data rows
-                        validation_requests.append({
-                            "setDataValidation": {
-                                "range": {
-                                    "sheetId": worksheet.id,
-                                    "startRowIndex": term_name_row + 1,  # Start from the row after term names
-                                    "endRowIndex": max(term_name_row + 20, len(updated_data)),  # Ensure we have enough rows
-                                    "startColumnIndex": col_idx,
-                                    "endColumnIndex": col_idx + 1
-                                },
-                                "rule": {
-                                    "condition": {
-                                        "type": "ONE_OF_LIST",
-                                        "values": [{"userEnteredValue": v} for v in cv_values]
-                                    },
-                                    "showCustomUi": True,
-                                    "strict": False
-                                }
-                            }
-                        })
+        # New column j holds noaa_fields row j, so the note/dropdown rows can be picked out up front
+        descriptions = noaa_fields['description'].to_numpy()
+        cv_lists = noaa_fields['_cv_values'].to_numpy()
+        has_desc = descriptions.astype(bool)
+        has_cv = noaa_fields['_cv_values'].map(bool).to_numpy()
         
-        # Apply notes
-        if note_requests:
-            worksheet.spreadsheet.batch_update({"requests": note_requests})
+        # Add descriptions as notes, one updateCells per run of adjacent columns
+        note_requests = _note_requests(worksheet.id, {new_cols[j]: descriptions[j] for j in np.flatnonzero(has_desc)}, row=term_name_row)
         
-        # Apply data validation
-        if validation_requests:
-            worksheet.spreadsheet.batch_update({"requests": validation_requests})
+        # Add controlled vocabulary dropdown to all data rows
+        for j in np.flatnonzero(has_cv):
+            col_idx = new_cols[j]
+            validation_requests.append({
+                "setDataValidation": {
+                    "range": {
+                        "sheetId": worksheet.id,
+                        "startRowIndex": term_name_row + 1,  # Start from the row after term names
+                        "endRowIndex": max(term_name_row + 20, len(data)),  # Ensure we have enough rows
+                        "startColumnIndex": col_idx,
+                        "endColumnIndex": col_idx + 1
+                    },
+                    "rule": _dropdown_rule(tuple(cv_lists[j]))
+                }
+            })
+        
+        # Append notes and validation after the data and formatting requests
+        batch_requests.extend(note_requests)
+        batch_requests.extend(validation_requests)
+        
+        # Execute all requests in one API call
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
         
     except Exception as e:
         raise Exception(f"Error adding NOAA fields to experimentRunMetadata: {e}")
@@ -817,10 +841,10 @@ def add_noaa_fields_to_sample_metadata(worksheet, noaa_fields):
         noaa_fields (pandas.DataFrame): DataFrame containing NOAA fields to add
     """
     try:
-        import pandas as pd
-        import numpy as np
-        import gspread_formatting as gsf
-        
+        # Nothing to add, so skip the sheet read and writes entirely
+        if noaa_fields.empty:
+            return
+            
         # Replace NaN values with empty strings
         noaa_fields = noaa_fields.fillna('')
         
@@ -830,104 +854,101 @@ def add_noaa_fields_to_sample_metadata(worksheet, noaa_fields):
             return
             
         # Find key rows
-        term_name_row = None
-        req_level_row = None
-        section_row = None
-        description_row = None
-        
-        for idx, row in enumerate(data):
-            if '# requirement_level_code' in row:
-                req_level_row = idx
-            if '# section' in row:
-                section_row = idx
-            if '# description' in row:
-                description_row = idx
-            # The term name row is typically the last row with actual field names
-            if any(col for col in row if isinstance(col, str) and not col.startswith('#')):
-                term_name_row = idx
+        term_name_row, req_level_row, section_row, description_row = _find_key_rows(data)
         
         if term_name_row is None or req_level_row is None or section_row is None:
             raise Exception("Could not find term name, requirement level, or section row in sampleMetadata")
         
-        term_name_row = term_name_row - 1  # Move term names up by one row
+        # New columns start right after the widest existing row
+        num_existing_cols = max(len(row) for row in data)
+        new_cols = list(range(num_existing_cols, num_existing_cols + len(noaa_fields)))
+        num_rows, num_cols = len(data), num_existing_cols + len(noaa_fields)
         
-        # Convert data to DataFrame for easier manipulation
-        sheet_df = pd.DataFrame(data)
+        # Build all new columns in a single block instead of growing a DataFrame
+        new_block = np.full((num_rows, len(noaa_fields)), '', dtype=object)
         
-        # Prepare new columns to add
-        new_cols = []
-        for _, row in noaa_fields.iterrows():
-            # Create a new column for the NOAA field
-            new_col_idx = sheet_df.shape[1]
-            sheet_df[new_col_idx] = ''
-            
-            # Set term name, requirement level, and section
-            sheet_df.iloc[term_name_row, new_col_idx] = row['term_name']
-            sheet_df.iloc[req_level_row, new_col_idx] = row['requirement_level_code']
-            sheet_df.iloc[section_row, new_col_idx] = row['section']
-            
-            # Set description if available
-            if description_row is not None and 'description' in row and row['description'] != '':
-                sheet_df.iloc[description_row, new_col_idx] = row['description']
-            
-            new_cols.append(new_col_idx)
+        # Set term name, requirement level, and section
+        new_block[term_name_row, :] = noaa_fields['term_name'].to_numpy()
+        new_block[req_level_row, :] = noaa_fields['requirement_level_code'].to_numpy()
+        new_block[section_row, :] = noaa_fields['section'].to_numpy()
         
-        # Replace any NaN values with empty strings
-        sheet_df = sheet_df.fillna('')
+        # Set description if available
+        if description_row is not None and 'description' in noaa_fields.columns:
+            new_block[description_row, :] = noaa_fields['description'].to_numpy()
         
-        # Convert back to list of lists for updating the sheet
-        updated_data = sheet_df.values.tolist()
+        # Only the header rows of the new columns carry values
+        used_rows = max(r for r in (term_name_row, req_level_row, section_row, description_row) if r is not None) + 1
         
-        # Update the worksheet with all data at once
-        worksheet.resize(rows=len(updated_data) + 10, cols=len(updated_data[0]) + 5)  # Add buffer
-        worksheet.update("A1", updated_data)
+        # Prepare a single batch request for the new columns, formatting, notes and validation
+        batch_requests = []
         
-        # Define color styles for requirement levels
-        color_styles = {
-            "M": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#E26B0A")),  # Mandatory - Orange
-            "HR": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFCC00")), # Highly recommended - Yellow
-            "R": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#FFFF99")),  # Recommended - Light yellow
-            "O": gsf.CellFormat(backgroundColor=gsf.Color.fromHex("#CCFF99"))   # Optional - Light green
-        }
+        # 1. Grow the grid for the new columns (and a row buffer) without shrinking it
+        missing_cols = num_cols - worksheet.col_count
+        if missing_cols > 0:
+            batch_requests.append({
+                "appendDimension": {
+                    "sheetId": worksheet.id,
+                    "dimension": "COLUMNS",
+                    "length": missing_cols
+                }
+            })
+        missing_rows = num_rows + 10 - worksheet.row_count  # Add buffer
+        if missing_rows > 0:
+            batch_requests.append({
+                "appendDimension": {
+                    "sheetId": worksheet.id,
+                    "dimension": "ROWS",
+                    "length": missing_rows
+                }
+            })
         
-        # Format cells based on requirement level
-        batch_requests = []
+        # 2. Write only the new columns; the existing cells are unchanged
+        batch_requests.append({
+            "updateCells": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": used_rows,
+                    "startColumnIndex": num_existing_cols,
+                    "endColumnIndex": num_cols
+                },
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]} for row in new_block[:used_rows]],
+                "fields": "userEnteredValue"
+            }
+        })
         
-        # Apply color formatting to requirement level cells
-        for col_idx in new_cols:
-            req_level = sheet_df.iloc[req_level_row, col_idx]
-            if req_level in color_styles:
+        # 3. Apply color formatting to requirement level cells, one request per run of equal levels
+        for req_level, run in groupby(new_cols, key=lambda c: new_block[req_level_row, c - num_existing_cols]):
+            run = list(run)
+            if req_level in _COLOR_STYLES:
                 batch_requests.append({
                     "repeatCell": {
                         "range": {
                             "sheetId": worksheet.id,
                             "startRowIndex": req_level_row,
                             "endRowIndex": req_level_row + 1,
-                            "startColumnIndex": col_idx,
-                            "endColumnIndex": col_idx + 1
+                            "startColumnIndex": run[0],
+                            "endColumnIndex": run[-1] + 1
                         },
                         "cell": {
                             "userEnteredFormat": {
-                                "backgroundColor": {
-                                    "red": color_styles[req_level].backgroundColor.red,
-                                    "green": color_styles[req_level].backgroundColor.green,
-                                    "blue": color_styles[req_level].backgroundColor.blue
-                                }
+                                "backgroundColor": _COLOR_STYLES[req_level]
                             }
                         },
                         "fields": "userEnteredFormat.backgroundColor"
                     }
                 })
                 
-            # Bold the term name
+        # Bold all new term names at once (new columns are appended contiguously)
+        if new_cols:
             batch_requests.append({
                 "repeatCell": {
                     "range": {
                         "sheetId": worksheet.id,
                         "startRowIndex": term_name_row,
                         "endRowIndex": term_name_row + 1,
-                        "startColumnIndex": col_idx,
-                        "endColumnIndex": col_idx + 1
+                        "startColumnIndex": new_cols[0],
+                        "endColumnIndex": new_cols[-1] + 1
                     },
                     "cell": {
                         "userEnteredFormat": {
@@ -940,72 +961,42 @@ def add_noaa_fields_to_sample_metadata(worksheet, noaa_fields):
                 }
             })
         
-        # Apply batch formatting
-        if batch_requests:
-            worksheet.spreadsheet.batch_update({"requests": batch_requests})
-            
-        # Add notes to term names and controlled vocabulary dropdowns
-        note_requests = []
+        # 4. Add notes to term names and controlled vocabulary dropdowns
         validation_requests = []
         
-        for col_idx in new_cols:
-            term_name = sheet_df.iloc[term_name_row, col_idx]
-            term_rows = noaa_fields[noaa_fields['term_name'] == term_name]
-            if not term_rows.empty:
-                term_info = term_rows.iloc[0]
-                
-                # Add description as note
-                if 'description' in term_info and term_info['description']:
-                    note_requests.append({
-                        "updateCells": {
+        # New column j holds noaa_fields row j, so the note/dropdown rows can be picked out up front
+        descriptions = noaa_fields['description'].to_numpy()
+        has_desc = descriptions.astype(bool)
+        
+        # Add descriptions as notes, one updateCells per run of adjacent columns
+        note_requests = _note_requests(worksheet.id, {new_cols[j]: descriptions[j] for j in np.flatnonzero(has_desc)}, row=term_name_row)
+        
+        # Add controlled vocabulary dropdown to all data rows, one request per run of columns sharing the same options.
+        # Skipped outright when none of the new fields has a vocabulary
+        if (noaa_fields['controlled_vocabulary_options'] != '').any():
+            cv_values = [tuple(values) for values in noaa_fields['_cv_values'].to_numpy()]
+            for values, run in groupby(zip(new_cols, cv_values), key=lambda c: c[1]):
+                if values:
+                    run = list(run)
+                    validation_requests.append({
+                        "setDataValidation": {
                             "range": {
                                 "sheetId": worksheet.id,
-                                "startRowIndex": term_name_row,
-                                "endRowIndex": term_name_row + 1,
-                                "startColumnIndex": col_idx,
-                                "endColumnIndex": col_idx + 1
+                                "startRowIndex": term_name_row + 1,  # Start from the row after term names
+                                "endRowIndex": max(term_name_row + 20, num_rows),  # Ensure we have enough rows
+                                "startColumnIndex": run[0][0],
+                                "endColumnIndex": run[-1][0] + 1
                             },
-                            "rows": [{
-                                "values": [{
-                                    "note": term_info['description']
-                                }]
-                            }],
-                            "fields": "note"
+                            "rule": _dropdown_rule(values)
                         }
                     })
-                
-                # Add controlled vocabulary dropdown
-                if 'controlled_vocabulary_options' in term_info and term_info['controlled_vocabulary_options']:
-                    # Parse the controlled vocabulary values
-                    cv_values = [v.strip() for v in str(term_info['controlled_vocabulary_options']).split('|') if v.strip()]
-                    if cv_values:
-                        validation_requests.append({
-                            "setDataValidation": {
-                                "range": {
-                                    "sheetId": worksheet.id,
-                                    "startRowIndex": term_name_row + 1,  # Start from the row after term names
-                                    "endRowIndex": max(term_name_row + 20, len(updated_data)),  # Ensure we have enough rows
-                                    "startColumnIndex": col_idx,
-                                    "endColumnIndex": col_idx + 1
-                                },
-                                "rule": {
-                                    "condition": {
-                                        "type": "ONE_OF_LIST",
-                                        "values": [{"userEnteredValue": v} for v in cv_values]
-                                    },
-                                    "showCustomUi": True,
-                                    "strict": False
-                                }
-                            }
-                        })
         
-        # Apply notes
-        if note_requests:
-            worksheet.spreadsheet.batch_update({"requests": note_requests})
+        # Append notes and validation after the data and formatting requests
+        batch_requests.extend(note_requests)
+        batch_requests.extend(validation_requests)
         
-        # Apply data validation
-        if validation_requests:
-            worksheet.spreadsheet.batch_update({"requests": validation_requests})
+        # Execute all requests in one API call
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
         
     except Exception as e:
         raise Exception(f"Error adding NOAA fields to sampleMetadata: {e}")
@@ -1027,7 +1018,11 @@ def remove_taxa_sheets(spreadsheet):
     except Exception as e:
         raise Exception(f"Error removing taxa sheets: {e}")
 
-def create_analysis_metadata_sheets(spreadsheet, config):
+def _analysis_grid_size(num_fields):
+    """Rows and columns an analysisMetadata sheet needs for num_fields NOAA fields, with a small buffer."""
+    return num_fields + 1 + 10, len(_ANALYSIS_HEADERS) + 5
+
+def create_analysis_metadata_sheets(spreadsheet, config, noaa_fields=None):
     """
     Create analysisMetadata Google Sheets for each analysis run name in the config.
     
@@ -1038,6 +1033,8 @@ def create_analysis_metadata_sheets(spreadsheet, config):
     Args:
         spreadsheet (gspread.Spreadsheet): The Google Spreadsheet object
         config (dict): Configuration loaded from NOAA_config.yaml
+        noaa_fields (pandas.DataFrame, optional): NOAA analysis fields that will be added,
+            used to create the sheets at their final size
         
     Returns:
         dict: Dictionary mapping analysis run names to their worksheet objects
@@ -1059,46 +1056,48 @@ def create_analysis_metadata_sheets(spreadsheet, config):
         
         # If no analysis runs are specified, or only the placeholder exists, create a single generic analysisMetadata sheet
         if not analysis_runs or "analysisMetadata_<analysis_run_name>" in analysis_runs:
-            sheet_name = "analysisMetadata_<analysis_run_name>"
-            try:
-                # Check if a sheet with this name already exists
-                existing_sheet = None
-                try:
-                    existing_sheet = spreadsheet.worksheet(sheet_name)
-                except gspread.exceptions.WorksheetNotFound:
-                    pass  # Sheet doesn't exist, which is fine
-
-                if not existing_sheet:
-                    worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=200, cols=100)
-                    analysis_worksheets[sheet_name] = worksheet
-                else:
-                    analysis_worksheets[sheet_name] = existing_sheet
-
-            except gspread.exceptions.APIError as e:
-                if "429" in str(e):  # Rate limit error
-                    time.sleep(60)
-                    worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=200, cols=100)
-                    analysis_worksheets[sheet_name] = worksheet
-                else:
-                    raise
+            sheet_names = {"analysisMetadata_<analysis_run_name>": "analysisMetadata_<analysis_run_name>"}
         else:
             # Create a sheet for each analysis run name
+            sheet_names = {}
             for analysis_run_name in analysis_runs:
                 # If the run name is the placeholder, use it directly. Otherwise, prepend the prefix.
                 if analysis_run_name == "analysisMetadata_<analysis_run_name>":
-                    sheet_name = analysis_run_name
+                    sheet_names[analysis_run_name] = analysis_run_name
                 else:
-                    sheet_name = f"analysisMetadata_{analysis_run_name}"
-                try:
-                    worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=200, cols=100)
-                    analysis_worksheets[analysis_run_name] = worksheet
-                except gspread.exceptions.APIError as e:
-                    if "429" in str(e):  # Rate limit error
-                        time.sleep(60)
-                        worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=200, cols=100)
-                        analysis_worksheets[analysis_run_name] = worksheet
-                    else:
-                        raise
+                    sheet_names[analysis_run_name] = f"analysisMetadata_{analysis_run_name}"
+        
+        # Check existing titles with a single metadata read instead of probing each name
+        worksheets_by_title = {ws.title: ws for ws in spreadsheet.worksheets()}
+        missing_names = [name for name in dict.fromkeys(sheet_names.values()) if name not in worksheets_by_title]
+        
+        # Create the sheets at the size the NOAA fields need rather than oversizing and shrinking later
+        if noaa_fields is not None:
+            row_count, col_count = _analysis_grid_size(len(noaa_fields))
+        else:
+            row_count, col_count = 200, 100
+        
+        # Add all missing sheets with one batchUpdate instead of one add_worksheet call per run
+        if missing_names:
+            add_sheet_requests = [{
+                "addSheet": {
+                    "properties": {
+                        "title": sheet_name,
+                        "gridProperties": {
+                            "rowCount": row_count,
+                            "columnCount": col_count
+                        }
+                    }
+                }
+            } for sheet_name in missing_names]
+            retry_on_429(lambda: spreadsheet.batch_update({"requests": add_sheet_requests}),
+                         rate_limiter=WRITE_RATE_LIMITER, retry_server_errors=False)
+            
+            # Refresh once to pick up the new sheets with their assigned ids and properties
+            worksheets_by_title = {ws.title: ws for ws in spreadsheet.worksheets()}
+        
+        for analysis_run_name, sheet_name in sheet_names.items():
+            analysis_worksheets[analysis_run_name] = worksheets_by_title[sheet_name]
         
         return analysis_worksheets
     
@@ -1116,69 +1115,53 @@ def add_noaa_fields_to_analysis_metadata(worksheet, noaa_fields, config, analysi
         analysis_run_name (str, optional): Specific analysis run name for this sheet
     """
     try:
-        import pandas as pd
-        import gspread
-        import gspread_formatting as gsf
-        import numpy as np
-        import time
-        
+        # Nothing to add, so skip building and sending the batch
+        if noaa_fields.empty:
+            return
+            
         # Replace NaN values with empty strings
         noaa_fields = noaa_fields.fillna('')
         
         # Initialize with required headers
-        headers = ['requirement_level_code', 'section', 'term_name', 'values']
-        
-        # Prepare rows to add
-        rows = []
-        for _, field in noaa_fields.iterrows():
-            row = {
-                'requirement_level_code': field['requirement_level_code'],
-                'section': field['section'],
-                'term_name': field['term_name'],
-                'values': ''  # Will be filled for auto-fill fields
-            }
-            
-            # Auto-fill values from config for specific fields
-            term_name = field['term_name']
-            if term_name == 'project_id':
-                row['values'] = config['project_id']
-            elif term_name == 'analysis_run_name' and analysis_run_name:
-                row['values'] = analysis_run_name
-            elif term_name == 'assay_name' and analysis_run_name:
-                row['values'] = config['analysis_run_name'][analysis_run_name]['assay_name']
-                
-            rows.append(row)
-        
-        # Convert to DataFrame for easier handling
-        df = pd.DataFrame(rows)
-        
-        # Prepare all data for a single batch update
-        all_data = [headers] + df.values.tolist()
-        
-        # Define color styles for requirement levels
-        color_styles = {
-            "M": {"red": 0.89, "green": 0.42, "blue": 0.04},  # #E26B0A - Orange
-            "HR": {"red": 1.0, "green": 0.8, "blue": 0.0},    # #FFCC00 - Yellow
-            "R": {"red": 1.0, "green": 1.0, "blue": 0.6},     # #FFFF99 - Light yellow
-            "O": {"red": 0.8, "green": 1.0, "blue": 0.6}      # #CCFF99 - Light green
-        }
+        headers = _ANALYSIS_HEADERS
+        
+        # Pull the columns out as arrays instead of iterating rows
+        codes = noaa_fields['requirement_level_code'].to_numpy()
+        sections = noaa_fields['section'].to_numpy()
+        names = noaa_fields['term_name'].to_numpy()
+        values = np.full(len(names), '', dtype=object)  # Will be filled for auto-fill fields
+        
+        # Auto-fill values from config for specific fields
+        is_project_id = names == 'project_id'
+        if is_project_id.any():
+            values[is_project_id] = config['project_id']
+        if analysis_run_name:
+            values[names == 'analysis_run_name'] = analysis_run_name
+            is_assay_name = names == 'assay_name'
+            if is_assay_name.any():
+                values[is_assay_name] = config['analysis_run_name'][analysis_run_name]['assay_name']
+        
+        # Prepare all data for a single batch update, cast to strings in one pass
+        all_data = [headers] + np.stack([codes, sections, names, values], axis=1).astype(str).tolist()
         
         # Prepare a single batch request for all operations
         batch_requests = []
         
-        # 1. Resize the worksheet
-        batch_requests.append({
-            "updateSheetProperties": {
-                "properties": {
-                    "sheetId": worksheet.id,
-                    "gridProperties": {
-                        "rowCount": len(all_data) + 10,  # Add buffer
-                        "columnCount": len(headers) + 5   # Add buffer
-                    }
-                },
-                "fields": "gridProperties(rowCount,columnCount)"
-            }
-        })
+        # 1. Resize the worksheet, unless it was already created at this size
+        row_count, col_count = _analysis_grid_size(len(noaa_fields))
+        if (worksheet.row_count, worksheet.col_count) != (row_count, col_count):
+            batch_requests.append({
+                "updateSheetProperties": {
+                    "properties": {
+                        "sheetId": worksheet.id,
+                        "gridProperties": {
+                            "rowCount": row_count,
+                            "columnCount": col_count
+                        }
+                    },
+                    "fields": "gridProperties(rowCount,columnCount)"
+                }
+            })
         
         # 2. Update all data at once
         batch_requests.append({
@@ -1190,7 +1173,7 @@ def add_noaa_fields_to_analysis_metadata(worksheet, noaa_fields, config, analysi
                     "startColumnIndex": 0,
                     "endColumnIndex": len(headers)
                 },
-                "rows": [{"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]} for row in all_data],
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": cell}} for cell in row]} for row in all_data],
                 "fields": "userEnteredValue"
             }
         })
@@ -1216,125 +1199,102 @@ def add_noaa_fields_to_analysis_metadata(worksheet, noaa_fields, config, analysi
             }
         })
         
-        # 4. Add formatting for each row
-        for i, row in enumerate(rows, start=2):  # Start from row 2 (after headers)
-            req_level = row['requirement_level_code']
-            
-            # Add requirement level color formatting
-            if req_level in color_styles:
+        # 4. Color the requirement level column, one request per run of equal levels
+        for req_level, run in groupby(enumerate(codes, start=1), key=lambda r: r[1]):
+            run = list(run)
+            if req_level in _COLOR_STYLES:
                 batch_requests.append({
                     "repeatCell": {
                         "range": {
                             "sheetId": worksheet.id,
-                            "startRowIndex": i-1,
-                            "endRowIndex": i,
+                            "startRowIndex": run[0][0],
+                            "endRowIndex": run[-1][0] + 1,
                             "startColumnIndex": 0,
                             "endColumnIndex": 1
                         },
                         "cell": {
                             "userEnteredFormat": {
-                                "backgroundColor": color_styles[req_level]
+                                "backgroundColor": _COLOR_STYLES[req_level]
                             }
                         },
                         "fields": "userEnteredFormat.backgroundColor"
                     }
                 })
-            
-            # Add term name bold formatting
+        
+        # 5. Bold all term names at once
+        batch_requests.append({
+            "repeatCell": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 1,
+                    "endRowIndex": len(names) + 1,
+                    "startColumnIndex": 2,  # term_name column
+                    "endColumnIndex": 3
+                },
+                "cell": {
+                    "userEnteredFormat": {
+                        "textFormat": {
+                            "bold": True
+                        }
+                    }
+                },
+                "fields": "userEnteredFormat.textFormat.bold"
+            }
+        })
+        
+        # 6. Add all description notes in one updateCells; rows without a description get an
+        # empty cell so their existing note is left alone rather than cleared
+        descriptions = noaa_fields['description'].to_numpy()
+        if (descriptions != '').any():
             batch_requests.append({
-                "repeatCell": {
+                "updateCells": {
                     "range": {
                         "sheetId": worksheet.id,
-                        "startRowIndex": i-1,
-                        "endRowIndex": i,
-                        "startColumnIndex": 2,  # term_name column
+                        "startRowIndex": 1,
+                        "endRowIndex": len(names) + 1,
+                        "startColumnIndex": 2,
                         "endColumnIndex": 3
                     },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
+                    "rows": [{"values": [{"note": description} if description else {}]} for description in descriptions],
+                    "fields": "note"
                 }
             })
-            
-            # Add description notes
-            description = noaa_fields[noaa_fields['term_name'] == row['term_name']]['description'].iloc[0]
-            if description:
-                batch_requests.append({
-                    "updateCells": {
-                        "range": {
-                            "sheetId": worksheet.id,
-                            "startRowIndex": i-1,
-                            "endRowIndex": i,
-                            "startColumnIndex": 2,
-                            "endColumnIndex": 3
-                        },
-                        "rows": [{
-                            "values": [{
-                                "note": description
-                            }]
-                        }],
-                        "fields": "note"
-                    }
-                })
-            
-            # Add controlled vocabulary dropdowns
-            cv_options = noaa_fields[noaa_fields['term_name'] == row['term_name']]['controlled_vocabulary_options'].iloc[0]
-            if pd.notna(cv_options) and cv_options:
-                values = [v.strip() for v in str(cv_options).split('|') if v.strip()]
-                if values:
+        
+        # 7. Add controlled vocabulary dropdowns, one request per run of rows sharing the same options,
+        # skipped outright when none of the fields has a vocabulary
+        if (noaa_fields['controlled_vocabulary_options'] != '').any():
+            cv_values = [tuple(options) for options in noaa_fields['_cv_values'].to_numpy()]
+            for options, run in groupby(enumerate(cv_values, start=1), key=lambda r: r[1]):
+                if options:
+                    run = list(run)
                     batch_requests.append({
                         "setDataValidation": {
                             "range": {
                                 "sheetId": worksheet.id,
-                                "startRowIndex": i-1,
-                                "endRowIndex": i,
+                                "startRowIndex": run[0][0],
+                                "endRowIndex": run[-1][0] + 1,
                                 "startColumnIndex": 3,  # values column
                                 "endColumnIndex": 4
                             },
-                            "rule": {
-                                "condition": {
-                                    "type": "ONE_OF_LIST",
-                                    "values": [{"userEnteredValue": v} for v in values]
-                                },
-                                "showCustomUi": True,
-                                "strict": False
-                            }
+                            "rule": _dropdown_rule(options)
                         }
                     })
         
-        # Execute all operations in a single batch request with exponential backoff retry
-        max_retries = 5
-        retry_count = 0
-        wait_time = 2  # Initial wait time in seconds
-        
-        while retry_count < max_retries:
-            try:
-                worksheet.spreadsheet.batch_update({"requests": batch_requests})
-                break  # Success, exit the retry loop
-            except gspread.exceptions.APIError as e:
-                if "429" in str(e) and retry_count < max_retries - 1:  # Rate limit error and still have retries
-                    retry_count += 1
-                    print(f"Rate limit hit. Retrying in {wait_time} seconds (attempt {retry_count}/{max_retries})...")
-                    time.sleep(wait_time)
-                    wait_time *= 2  # Exponential backoff
-                else:
-                    raise  # Re-raise if it's not a rate limit error or we're out of retries
+        # Execute all operations in a single batch request, paced and retried on 429
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
         
     except Exception as e:
         raise Exception(f"Error adding NOAA fields to analysisMetadata: {e}")
     
-def update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config):
+def update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config, worksheets=None):
     """
     Update the README sheet to reflect the FAIRe2NOAA structure.
     
     Args:
         spreadsheet (gspread.Spreadsheet): The Google Spreadsheet object
         config (dict): Configuration loaded from NOAA_config.yaml
+        worksheets (list, optional): Current worksheets of the spreadsheet, if the caller
+            already has them. Fetched once here otherwise.
         
     Returns:
         None
@@ -1343,30 +1303,32 @@ def update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config):
         Exception: If there's an error updating the README sheet
     """
     try:
+        # One metadata read serves both the README lookup and the sheet list below
+        if worksheets is None:
+            worksheets = spreadsheet.worksheets()
+        
         # Get the README worksheet
-        readme_sheet = spreadsheet.worksheet("README")
-        
-        # Get all values from the README sheet
-        all_values = readme_sheet.get_all_values()
-        
-        # Find the positions of key sections
-        timestamp_section_start = None
-        template_params_start = None
-        req_levels_start = None
-        sheets_section_start = None
-        
-        for i, row in enumerate(all_values):
-            if row and row[0] == 'Modification Timestamp:':
-                timestamp_section_start = i
-            elif row and row[0] == 'Template parameters:':
-                template_params_start = i
-            elif row and row[0] == 'Requirement levels:':
-                req_levels_start = i
-            elif row and row[0] == 'Sheets in this Google sheet:':
-                sheets_section_start = i
+        readme_sheet = next((ws for ws in worksheets if ws.title == "README"), None)
+        if readme_sheet is None:
+            raise gspread.exceptions.WorksheetNotFound("README")
+        
+        # Section markers and their content all live in column A, so read only that column
+        col_a = readme_sheet.col_values(1)
+        
+        # Find the positions of key sections in one pass
+        section_markers = {'Modification Timestamp:', 'Template parameters:', 'Requirement levels:', 'Sheets in this Google sheet:'}
+        markers = {value: i for i, value in enumerate(col_a) if value in section_markers}
+        timestamp_section_start = markers.get('Modification Timestamp:')
+        template_params_start = markers.get('Template parameters:')
+        req_levels_start = markers.get('Requirement levels:')
+        sheets_section_start = markers.get('Sheets in this Google sheet:')
+        
+        # Every change below hangs off the timestamp section, so there is nothing to do without it
+        if timestamp_section_start is None:
+            return
         
         # Get all worksheet names except README and Drop-down values
-        sheet_names = [ws.title for ws in spreadsheet.worksheets() 
+        sheet_names = [ws.title for ws in worksheets
                       if ws.title not in ["README", "Drop-down values"]]
         
         # Prepare batch requests for updating content and formatting
@@ -1386,462 +1348,155 @@ def update_readme_sheet_for_FAIRe2NOAA(spreadsheet, config):
             }
         })
         
+        # Lay out every README row from the timestamp section down as one block, tracking
+        # header and requirement-level rows by their offset for formatting afterwards
+        readme_rows = []
+        bold_rows = []
+        color_rows = []
+        
         # 1. Change "Modification Timestamp:" to "Sheets in this Google Sheet:"
-        if timestamp_section_start is not None:
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": timestamp_section_start,
-                        "endRowIndex": timestamp_section_start + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": "Sheets in this Google Sheet:"}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # Format the header row (bold)
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": timestamp_section_start,
-                        "endRowIndex": timestamp_section_start + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
-            
-            # Add the "Sheet Name Timestamp Email" header row
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": timestamp_section_start + 1,
-                        "endRowIndex": timestamp_section_start + 2,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 3
-                    },
-                    "rows": [{"values": [
-                        {"userEnteredValue": {"stringValue": "Sheet Name"}},
-                        {"userEnteredValue": {"stringValue": "Timestamp"}},
-                        {"userEnteredValue": {"stringValue": "Email"}}
-                    ]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # Create rows for the sheet list with empty cells for timestamp and email
-            sheet_list_rows = []
-            for name in sheet_names:
-                sheet_list_rows.append([name, "", ""])
-            
-            # Add an empty row at the end of the sheet list
-            sheet_list_rows.append(["", "", ""])
-            
-            # Update the sheet list (starting from row after the header)
-            sheet_rows_data = []
-            for row in sheet_list_rows:
-                sheet_row_data = {"values": [
-                    {"userEnteredValue": {"stringValue": ""}},
-                    {"userEnteredValue": {"stringValue": ""}},
-                    {"userEnteredValue": {"stringValue": ""}}
-                ]}
-                
-                # Safely set values for each column
-                if len(row) > 0:
-                    sheet_row_data["values"][0]["userEnteredValue"]["stringValue"] = str(row[0])
-                if len(row) > 1:
-                    sheet_row_data["values"][1]["userEnteredValue"]["stringValue"] = str(row[1])
-                if len(row) > 2:
-                    sheet_row_data["values"][2]["userEnteredValue"]["stringValue"] = str(row[2])
-                
-                sheet_rows_data.append(sheet_row_data)
-            
-            # Calculate where Template parameters should start
-            template_params_row = timestamp_section_start + 2 + len(sheet_rows_data)
-            
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": timestamp_section_start + 2,  # +2 to skip header row
-                        "endRowIndex": template_params_row,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 3  # Include all three columns
-                    },
-                    "rows": sheet_rows_data,
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # 2. Add "Template Parameters:" after the sheet list
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": template_params_row,
-                        "endRowIndex": template_params_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": "Template parameters:"}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # Format the header row (bold)
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": template_params_row,
-                        "endRowIndex": template_params_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
-            
-            # Find the template parameters content
-            template_params_content = []
-            if template_params_start is not None:
-                for i in range(template_params_start + 1, req_levels_start):
-                    if all_values[i] and all_values[i][0]:
-                        template_params_content.append([all_values[i][0]])
-            
-            # Add template parameters content
-            if template_params_content:
-                batch_requests.append({
-                    "updateCells": {
-                        "range": {
-                            "sheetId": readme_sheet.id,
-                            "startRowIndex": template_params_row + 1,
-                            "endRowIndex": template_params_row + 1 + len(template_params_content),
-                            "startColumnIndex": 0,
-                            "endColumnIndex": 1
-                        },
-                        "rows": [{"values": [{"userEnteredValue": {"stringValue": row[0]}}]} for row in template_params_content],
-                        "fields": "userEnteredValue"
-                    }
-                })
-                
-                # Update where requirement levels should start
-                req_levels_row = template_params_row + 1 + len(template_params_content) + 1  # +1 for empty row
-            else:
-                req_levels_row = template_params_row + 1
-            
-            # Add empty row after template parameters
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": req_levels_row - 1,
-                        "endRowIndex": req_levels_row,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": ""}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # 3. Add "Requirement levels:" section
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": req_levels_row,
-                        "endRowIndex": req_levels_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": "Requirement levels:"}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # Format the header row (bold)
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": req_levels_row,
-                        "endRowIndex": req_levels_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
-            
-            # Find the requirement levels content
-            req_levels_content = []
-            if req_levels_start is not None:
-                for i in range(req_levels_start + 1, sheets_section_start):
-                    if all_values[i] and all_values[i][0]:
-                        req_levels_content.append([all_values[i][0]])
-            
-            # Add requirement levels content
-            if req_levels_content:
-                batch_requests.append({
-                    "updateCells": {
-                        "range": {
-                            "sheetId": readme_sheet.id,
-                            "startRowIndex": req_levels_row + 1,
-                            "endRowIndex": req_levels_row + 1 + len(req_levels_content),
-                            "startColumnIndex": 0,
-                            "endColumnIndex": 1
-                        },
-                        "rows": [{"values": [{"userEnteredValue": {"stringValue": row[0]}}]} for row in req_levels_content],
-                        "fields": "userEnteredValue"
-                    }
-                })
-                
-                # Add color formatting for requirement level rows
-                color_styles = {
-                    "M": {"red": 0.89, "green": 0.42, "blue": 0.04},  # #E26B0A - Orange
-                    "HR": {"red": 1.0, "green": 0.8, "blue": 0.0},    # #FFCC00 - Yellow
-                    "R": {"red": 1.0, "green": 1.0, "blue": 0.6},     # #FFFF99 - Light yellow
-                    "O": {"red": 0.8, "green": 1.0, "blue": 0.6}      # #CCFF99 - Light green
-                }
-                
-                # Apply color formatting to each requirement level row
-                for i, row in enumerate(req_levels_content):
-                    level = row[0].split('=')[0].strip()
-                    if level in color_styles:
-                        batch_requests.append({
-                            "repeatCell": {
-                                "range": {
-                                    "sheetId": readme_sheet.id,
-                                    "startRowIndex": req_levels_row + 1 + i,
-                                    "endRowIndex": req_levels_row + 2 + i,
-                                    "startColumnIndex": 0,
-                                    "endColumnIndex": 1
-                                },
-                                "cell": {
-                                    "userEnteredFormat": {
-                                        "backgroundColor": color_styles[level]
-                                    }
-                                },
-                                "fields": "userEnteredFormat.backgroundColor"
-                            }
-                        })
-                
-                # Update where instructions should start
-                instructions_row = req_levels_row + 1 + len(req_levels_content) + 1  # +1 for empty row
-            else:
-                instructions_row = req_levels_row + 1
-            
-            # Add empty row after requirement levels
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": instructions_row - 1,
-                        "endRowIndex": instructions_row,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": ""}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # 4. Add "Instructions:" section
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": instructions_row,
-                        "endRowIndex": instructions_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": "Instructions:"}}]}],
-                    "fields": "userEnteredValue"
-                }
-            })
-            
-            # Format the header row (bold)
-            batch_requests.append({
-                "repeatCell": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": instructions_row,
-                        "endRowIndex": instructions_row + 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "cell": {
-                        "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
-                            }
-                        }
-                    },
-                    "fields": "userEnteredFormat.textFormat.bold"
-                }
-            })
-            
-            # Add instructions content
-            instructions = [
-                ["1. Enter your data into the projectMetadata, sampleMetadata, and experimentRunMetadata sheets."],
-                ["2. If you only have one generic analysisMetadata sheet (meaning you don't have an analysis ready yet) continue to Step 3. If you have analyses ready, skip to Step 4."],
-                ["3. Once you do have analyses ready, copy the generic analysisMetadata sheet for as many analyses as you have, and rename them appropriately to analysisMetadata<analysis_run_name>, and fill in the data."],
-                ["	- When filling in your data, be careful of the following:"],
-                ["	- The 'project_id' MUST be the same as the name of the project_id in the projectMetadata sheet."],
-                ["	- The 'analysis_run_name' MUST be the same as the name of the analysis_run_name in the projectMetadata sheet. If you have multiple analyses, seperate each analysis_run_name with a pipe: gomecc4_16s_p1-2_v2024.10_241122 | gomecc4_16s_p3-6_v2024.10_241122. An analysis can only have one analysis_run_name."],
-                ["  - The 'assay_name' MUST match one of the assay_names in the projectMetadata sheet. Each assay_name must be seperated by a pipe: ssu16sv4v5-emp |ssu18sv9-emp. An analysis can only have one assay_name."],
-                ["4. Fill in the data for you analysisMetadata sheets. Since you specified your analysis_run_names and assay_names in the NOAA_config.yaml file, those fields will auto-fill for you, so you dont have to worry about Step 3."],
-                ["5. Optional: For modification history and data validation (Checks for the requirements in Step 3), copy and paste the Google Apps Script from the README into the Google Sheet"],
-                ["	- In Google Sheets, go to Extensions > Apps Script > Copy and paste the script > Hit Save"],
-                ["6. Ensure all mandatory (M) fields are filled before submission."],
-                ["7. Now your data is ready for submission to ODE and edna2obis!"],
-                ["8. For each sheet, (except for the README and Drop-down values), download them as a TSV file. This is required for ODE and edna2obis submission."],
-                ["	- In Google Sheets, go to File > Download > TSV, for each sheet."],
-                ["9. For ODE Submission, go here: https://www.oceandnaexplorer.org/submit"],
-                ["10. For edna2obis Submission, go here: https://github.com/aomlomics/edna2obis"],
-                ["11. Please don't hesitate to reach out to us with questions or concerns: bayden.willms@noaa.gov"]
-            ]
-            
-            batch_requests.append({
-                "updateCells": {
-                    "range": {
-                        "sheetId": readme_sheet.id,
-                        "startRowIndex": instructions_row + 1,
-                        "endRowIndex": instructions_row + 1 + len(instructions),
-                        "startColumnIndex": 0,
-                        "endColumnIndex": 1
-                    },
-                    "rows": [{"values": [{"userEnteredValue": {"stringValue": row[0]}}]} for row in instructions],
-                    "fields": "userEnteredValue"
-                }
-            })
+        bold_rows.append(len(readme_rows))
+        readme_rows.append(["Sheets in this Google Sheet:"])
+        
+        # Add the "Sheet Name Timestamp Email" header row (bold)
+        bold_rows.append(len(readme_rows))
+        readme_rows.append(["Sheet Name", "Timestamp", "Email"])
+        
+        # Add the sheet list with empty cells for timestamp and email, then an empty row
+        readme_rows.extend([name, "", ""] for name in sheet_names)
+        readme_rows.append(["", "", ""])
+        
+        # 2. Add "Template Parameters:" after the sheet list
+        bold_rows.append(len(readme_rows))
+        readme_rows.append(["Template parameters:"])
+        
+        # Copy the template parameters content, then an empty row
+        template_params_content = []
+        if template_params_start is not None:
+            template_params_content = [value for value in col_a[template_params_start + 1:req_levels_start] if value]
+        if template_params_content:
+            readme_rows.extend([value] for value in template_params_content)
+            readme_rows.append([""])
+        
+        # 3. Add "Requirement levels:" section
+        bold_rows.append(len(readme_rows))
+        readme_rows.append(["Requirement levels:"])
+        
+        # Copy the requirement levels content, noting which rows get a level color, then an empty row
+        req_levels_content = []
+        if req_levels_start is not None:
+            req_levels_content = [value for value in col_a[req_levels_start + 1:sheets_section_start] if value]
+        if req_levels_content:
+            for value in req_levels_content:
+                level = value.split('=')[0].strip()
+                if level in _COLOR_STYLES:
+                    color_rows.append((len(readme_rows), level))
+                readme_rows.append([value])
+            readme_rows.append([""])
+        
+        # 4. Add "Instructions:" section
+        bold_rows.append(len(readme_rows))
+        readme_rows.append(["Instructions:"])
+        
+        # Add instructions content
+        instructions = [
+            ["1. Enter your data into the projectMetadata, sampleMetadata, and experimentRunMetadata sheets."],
+            ["2. If you only have one generic analysisMetadata sheet (meaning you don't have an analysis ready yet) continue to Step 3. If you have analyses ready, skip to Step 4."],
+            ["3. Once you do have analyses ready, copy the generic analysisMetadata sheet for as many analyses as you have, and rename them appropriately to analysisMetadata<analysis_run_name>, and fill in the data."],
+            ["	- When filling in your data, be careful of the following:"],
+            ["	- The 'project_id' MUST be the same as the name of the project_id in the projectMetadata sheet."],
+            ["	- The 'analysis_run_name' MUST be the same as the name of the analysis_run_name in the projectMetadata sheet. If you have multiple analyses, seperate each analysis_run_name with a pipe: gomecc4_16s_p1-2_v2024.10_241122 | gomecc4_16s_p3-6_v2024.10_241122. An analysis can only have one analysis_run_name."],
+            ["  - The 'assay_name' MUST match one of the assay_names in the projectMetadata sheet. Each assay_name must be seperated by a pipe: ssu16sv4v5-emp |ssu18sv9-emp. An analysis can only have one assay_name."],
+            ["4. Fill in the data for you analysisMetadata sheets. Since you specified your analysis_run_names and assay_names in the NOAA_config.yaml file, those fields will auto-fill for you, so you dont have to worry about Step 3."],
+            ["5. Optional: For modification history and data validation (Checks for the requirements in Step 3), copy and paste the Google Apps Script from the README into the Google Sheet"],
+            ["	- In Google Sheets, go to Extensions > Apps Script > Copy and paste the script > Hit Save"],
+            ["6. Ensure all mandatory (M) fields are filled before submission."],
+            ["7. Now your data is ready for submission to ODE and edna2obis!"],
+            ["8. For each sheet, (except for the README and Drop-down values), download them as a TSV file. This is required for ODE and edna2obis submission."],
+            ["	- In Google Sheets, go to File > Download > TSV, for each sheet."],
+            ["9. For ODE Submission, go here: https://www.oceandnaexplorer.org/submit"],
+            ["10. For edna2obis Submission, go here: https://github.com/aomlomics/edna2obis"],
+            ["11. Please don't hesitate to reach out to us with questions or concerns: bayden.willms@noaa.gov"]
+        ]
+        readme_rows.extend(instructions)
+        
+        # Build each cell with its value and format together, so headers and level colors need no separate requests.
+        # Blank cells are sent without a value, which clears the old one under the userEnteredValue mask
+        bold_rows = set(bold_rows)
+        color_rows = dict(color_rows)
+        cell_rows = []
+        for offset, row in enumerate(readme_rows):
+            cells = []
+            for cell in row:
+                cell_data = {"userEnteredFormat": {"textFormat": {"bold": offset in bold_rows}}}
+                if cell:
+                    cell_data["userEnteredValue"] = {"stringValue": str(cell)}
+                cells.append(cell_data)
+            if offset in color_rows:
+                cells[0]["userEnteredFormat"]["backgroundColor"] = _COLOR_STYLES[color_rows[offset]]
+            cell_rows.append({"values": cells})
+        
+        # Write every row in one updateCells; anchoring at a start cell leaves cells past each row's end untouched
+        batch_requests.append({
+            "updateCells": {
+                "start": {
+                    "sheetId": readme_sheet.id,
+                    "rowIndex": timestamp_section_start,
+                    "columnIndex": 0
+                },
+                "rows": cell_rows,
+                "fields": "userEnteredValue,userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
+            }
+        })
         
         # Apply all batch requests
         if batch_requests:
-            readme_sheet.spreadsheet.batch_update({"requests": batch_requests})
+            batch_update_with_retry(readme_sheet.spreadsheet, batch_requests)
             
     except Exception as e:
         raise Exception(f"Error updating README sheet for FAIRe2NOAA: {e}")
 
-def update_noaa_vocab_dropdowns(spreadsheet, noaa_checklist_path):
+def update_noaa_vocab_dropdowns(spreadsheet, noaa_checklist_path, worksheets=None):
     """
     Update dropdown values in metadata sheets and Drop-down values sheet to use NOAA-specific controlled vocabulary.
     
     Args:
         spreadsheet (gspread.Spreadsheet): The Google Sheet to update
         noaa_checklist_path (str): Path to the NOAA checklist Excel file
+        worksheets (list, optional): Current worksheets of the spreadsheet, if the caller
+            already has them. Fetched once here otherwise.
     """
     try:
-        import pandas as pd
-        
         # Read NOAA checklist to get updated vocabulary
-        noaa_checklist = pd.read_excel(noaa_checklist_path, sheet_name='checklist')
+        noaa_checklist = _read_checklist(noaa_checklist_path)
         
         # Build a mapping of term_name to controlled_vocabulary_options
-        vocab_map = {}
-        for _, row in noaa_checklist.iterrows():
-            term_name = row.get('term_name')
-            cv_options = row.get('controlled_vocabulary_options')
-            if pd.notna(term_name) and pd.notna(cv_options):
-                cv_str = str(cv_options).strip()
-                if cv_str and cv_str != 'nan':
-                    vocab_map[term_name] = [v.strip() for v in cv_str.split('|') if v.strip()]
+        vocab_map = _vocab_by_term(noaa_checklist)
         
         if not vocab_map:
             return
         
+        # Resolve every sheet from one metadata read instead of one worksheet() call per name
+        if worksheets is None:
+            worksheets = spreadsheet.worksheets()
+        worksheets_by_title = {ws.title: ws for ws in worksheets}
+        
         # Update Drop-down values sheet first
-        try:
-            dropdown_sheet = spreadsheet.worksheet('Drop-down values')
+        dropdown_sheet = worksheets_by_title.get('Drop-down values')
+        if dropdown_sheet is not None:
             _update_dropdown_values_sheet(dropdown_sheet, vocab_map)
-        except gspread.exceptions.WorksheetNotFound:
-            pass
         
         # Update dropdowns in metadata sheets
         metadata_sheets = ['projectMetadata', 'sampleMetadata', 'experimentRunMetadata']
         for sheet_name in metadata_sheets:
-            try:
-                worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = worksheets_by_title.get(sheet_name)
+            if worksheet is not None:
                 _update_sheet_dropdowns(worksheet, vocab_map)
-            except gspread.exceptions.WorksheetNotFound:
-                continue
             
     except Exception as e:
         raise Exception(f"Error updating NOAA vocabulary dropdowns: {e}")
 
 
-def _is_rate_limit_error(e):
-    """
-    Returns True if the exception looks like a Google Sheets API rate limit (HTTP 429).
-    """
-    return "429" in str(e)
-
-
-def _run_with_429_retry(fn, *, max_attempts=6, base_sleep_seconds=10, max_sleep_seconds=60):
-    """
-    Run a function that makes Sheets API writes, retrying on HTTP 429.
-    
-    Why: The Sheets API has per-minute write quotas. Even with batch updates, large
-    templates can occasionally hit the limit. Retrying with backoff makes this step
-    resilient without requiring users to shrink descriptions/vocabulary.
-    """
-    last_exc = None
-    for attempt in range(max_attempts):
-        try:
-            return fn()
-        except gspread.exceptions.APIError as e:
-            last_exc = e
-            if not _is_rate_limit_error(e):
-                raise
-            sleep_s = min(max_sleep_seconds, base_sleep_seconds * (2 ** attempt))
-            time.sleep(sleep_s)
-    # If we exhausted retries, re-raise the last error for visibility.
-    raise last_exc
-
-
-def _batch_update_requests_with_retry(spreadsheet, requests, *, chunk_size=200):
-    """
-    Send Sheets API batchUpdate requests in chunks, with 429 retry.
-    
-    Note: Each `batch_update` call counts as a single write request, so chunking too
-    small can increase quota pressure. We default to a moderately large chunk.
-    """
-    if not requests:
-        return
-    for i in range(0, len(requests), chunk_size):
-        batch = requests[i:i + chunk_size]
-        _run_with_429_retry(lambda: spreadsheet.batch_update({"requests": batch}))
-
-
 def _update_sheet_dropdowns(worksheet, vocab_map):
     """
     Update data validation dropdowns in a metadata sheet based on vocab_map.
@@ -1862,13 +1517,14 @@ def _update_sheet_dropdowns(worksheet, vocab_map):
 
         # ----- Case 1: Long-format sheet (row 1 is headers incl. term_name) -----
         headers = data[0]
-        if 'term_name' in headers:
-            term_name_col_idx = headers.index('term_name')
+        col_idx = {h: i for i, h in enumerate(headers)}
+        if 'term_name' in col_idx:
+            term_name_col_idx = col_idx['term_name']
 
             # In projectMetadata, dropdowns are intended for `project_level` + assay columns.
             # If `project_level` isn't present, fall back to the column immediately after term_name.
-            if 'project_level' in headers:
-                start_value_col_idx = headers.index('project_level')
+            if 'project_level' in col_idx:
+                start_value_col_idx = col_idx['project_level']
             else:
                 start_value_col_idx = min(term_name_col_idx + 1, len(headers))
 
@@ -1900,18 +1556,11 @@ def _update_sheet_dropdowns(worksheet, vocab_map):
                             "startColumnIndex": start_value_col_idx,
                             "endColumnIndex": end_value_col_idx
                         },
-                        "rule": {
-                            "condition": {
-                                "type": "ONE_OF_LIST",
-                                "values": [{"userEnteredValue": v} for v in cv_values]
-                            },
-                            "showCustomUi": True,
-                            "strict": False
-                        }
+                        "rule": _dropdown_rule(tuple(cv_values))
                     }
                 })
 
-            _batch_update_requests_with_retry(worksheet.spreadsheet, validation_requests)
+            batch_update_with_retry(worksheet.spreadsheet, validation_requests)
             return
 
         # ----- Case 2: Wide-format sheet (term names appear in a row) -----
@@ -1958,18 +1607,11 @@ def _update_sheet_dropdowns(worksheet, vocab_map):
                         "startColumnIndex": col_idx,
                         "endColumnIndex": col_idx + 1
                     },
-                    "rule": {
-                        "condition": {
-                            "type": "ONE_OF_LIST",
-                            "values": [{"userEnteredValue": v} for v in cv_values]
-                        },
-                        "showCustomUi": True,
-                        "strict": False
-                    }
+                    "rule": _dropdown_rule(tuple(cv_values))
                 }
             })
 
-        _batch_update_requests_with_retry(worksheet.spreadsheet, validation_requests)
+        batch_update_with_retry(worksheet.spreadsheet, validation_requests)
             
     except Exception as e:
         raise Exception(f"Error updating sheet dropdowns: {e}")
@@ -1984,8 +1626,6 @@ def _update_dropdown_values_sheet(worksheet, vocab_map):
         vocab_map (dict): Mapping of term_name to list of vocabulary options
     """
     try:
-        import pandas as pd
-        
         # Get current data
         current_data = worksheet.get_all_values()
         if not current_data:
@@ -2006,26 +1646,25 @@ def _update_dropdown_values_sheet(worksheet, vocab_map):
             if col_name not in df.columns:
                 df[col_name] = ''
         
-        # Update each term that has new vocabulary
-        for term_name, cv_values in vocab_map.items():
-            # Find rows matching this term
-            mask = df['term_name'] == term_name
-            if mask.any():
-                # Update n_options
-                df.loc[mask, 'n_options'] = len(cv_values)
-                
-                # Clear all vocab columns first
-                for col in df.columns:
-                    if col.startswith('vocab'):
-                        df.loc[mask, col] = ''
-                
-                # Add new vocab values
-                for idx, value in enumerate(cv_values):
-                    col_name = f'vocab{idx + 1}'
-                    df.loc[mask, col_name] = value
+        # Look up every row's new vocabulary at once instead of scanning the sheet per term
+        new_vocab = df['term_name'].map(vocab_map)
+        has_vocab = new_vocab.notna()
+        if has_vocab.any():
+            new_vocab = new_vocab[has_vocab]
+            
+            # Update n_options
+            df.loc[has_vocab, 'n_options'] = new_vocab.map(len)
+            
+            # Replace all vocab columns of the matched rows, clearing any options beyond the new list
+            vocab_cols = [col for col in df.columns if col.startswith('vocab')]
+            vocab_block = pd.DataFrame(
+                [{f'vocab{idx + 1}': value for idx, value in enumerate(cv_values)} for cv_values in new_vocab],
+                index=new_vocab.index, columns=vocab_cols
+            ).fillna('')
+            df.loc[has_vocab, vocab_cols] = vocab_block
         
         # Clear worksheet and write updated data
-        _run_with_429_retry(lambda: worksheet.clear())
+        retry_on_429(lambda: worksheet.clear(), rate_limiter=WRITE_RATE_LIMITER)
         
         # Prepare data for update (convert NaN to empty strings)
         data_to_write = [df.columns.tolist()]
@@ -2039,14 +1678,14 @@ def _update_dropdown_values_sheet(worksheet, vocab_map):
             data_to_write.append(row_data)
         
         # Write data
-        _run_with_429_retry(lambda: worksheet.update('A1', data_to_write))
+        retry_on_429(lambda: worksheet.update(range_name='A1', values=data_to_write, value_input_option='RAW'), rate_limiter=WRITE_RATE_LIMITER)
         
         # Format headers
-        _run_with_429_retry(lambda: worksheet.format('1:1', {
+        retry_on_429(lambda: worksheet.format('1:1', {
             "textFormat": {
                 "bold": True
             }
-        }))
+        }), rate_limiter=WRITE_RATE_LIMITER)
         
     except Exception as e:
         raise Exception(f"Error updating Drop-down values sheet: {e}")
@@ -2056,17 +1695,15 @@ def show_next_steps_page():
     """
     Opens the next steps page in the default web browser.
     This page shows what to do after successful FAIRe2NOAA conversion.
+    Only the first call in a run opens the page.
     """
+    global _next_steps_shown
+    if _next_steps_shown:
+        return
     try:
-        # Get the absolute path to the next_steps.html file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        next_steps_path = os.path.join(current_dir, 'next_steps.html')
-        
-        # Convert the file path to a file URL
-        file_url = 'file:///' + next_steps_path.replace('\\', '/')
-        
-        # Open the page in the default browser
-        webbrowser.open(file_url)
+        # Reuse an existing browser window where possible
+        webbrowser.open(_NEXT_STEPS_URL, new=0)
+        _next_steps_shown = True
         
     except Exception as e:
-        print(f"Warning: Could not open next steps page: {e}")
\ No newline at end of file
+        print(f"Warning: Could not open next steps page: {e}")
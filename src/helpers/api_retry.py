@@ -2,62 +2,259 @@
 Centralized retry utility for Google Sheets API calls.
 
 Google Sheets API has a quota of ~60 write requests per minute per user.
-This module provides retry-with-backoff for any API call that might hit 429.
+This module provides retry-with-backoff for any API call that might hit 429, and
+for transient 500/503 errors on calls that are safe to send twice.
 """
 
+import os
 import time
+import random
+import threading
 import gspread
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket for pacing Sheets API requests on the client side.
+    
+    Args:
+        capacity: Maximum number of requests that can be sent in a burst
+        refill_per_sec: Number of tokens added back per second
+    """
+    
+    def __init__(self, capacity, refill_per_sec):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """
+        Block until a token is available, then consume it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_per_sec)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.refill_per_sec
+            time.sleep(wait_s)
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker that fails calls fast after repeated quota exhaustion.
+    
+    Once failure_threshold calls in a row have run out of retries on 429s, the breaker
+    opens and calls are refused until cooldown_seconds have passed. The next call is then
+    let through; a success closes the breaker, another exhaustion opens it again.
+    
+    Args:
+        failure_threshold: Consecutive exhausted calls before the breaker opens
+        cooldown_seconds: How long to refuse calls once open
+    """
+    
+    def __init__(self, failure_threshold, cooldown_seconds):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        """
+        Returns True unless the breaker is open and still cooling down.
+        """
+        with self._lock:
+            return self._opened_at is None or time.monotonic() - self._opened_at >= self.cooldown_seconds
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+# Shared by all threads: stay just under the 60 write requests/minute/user quota
+WRITE_RATE_LIMITER = TokenBucket(capacity=55, refill_per_sec=55 / 60.0)
+
+# At most this many batchUpdate calls in flight at once across all worker threads
+WRITE_CONCURRENCY = threading.BoundedSemaphore(3)
+
+# Stop hammering the API once the quota is clearly gone rather than retrying every call for minutes
+QUOTA_BREAKER = CircuitBreaker(failure_threshold=3, cooldown_seconds=120)
+
+
 def is_rate_limit_error(e):
     """
     Returns True if the exception is a Google Sheets API rate limit (HTTP 429).
+    
+    Checks the HTTP status on the attached response rather than searching the
+    serialized error body, which can mention "429" for unrelated reasons.
     """
+    status_code = getattr(getattr(e, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code == 429
     return "429" in str(e)
 
 
-def retry_on_429(fn, *, max_attempts=8, base_sleep_seconds=15, max_sleep_seconds=90):
+# Google's internal/unavailable errors. Unlike a 429, the request may already have been applied
+_SERVER_ERROR_STATUS_CODES = {500, 503}
+
+# batchUpdate request kinds that change the sheet structure; sending one twice is not harmless
+_STRUCTURAL_REQUEST_KINDS = {"addSheet", "deleteSheet", "appendDimension", "insertDimension", "deleteDimension"}
+
+
+def is_retryable_error(e, retry_server_errors=True):
+    """
+    Returns True if the exception is a transient Sheets API error: a 429, or a 500/503
+    when retry_server_errors is set.
+    """
+    status_code = getattr(getattr(e, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or (retry_server_errors and status_code in _SERVER_ERROR_STATUS_CODES)
+    return is_rate_limit_error(e) or "RESOURCE_EXHAUSTED" in str(e)
+
+
+def _has_structural_requests(requests):
+    """
+    Returns True if any batchUpdate request adds/removes sheets, rows or columns.
+    """
+    return any(kind in _STRUCTURAL_REQUEST_KINDS for request in requests for kind in request)
+
+
+def _retry_after_seconds(e):
+    """
+    Returns the server's Retry-After delay in seconds, or None if it didn't send one.
+    """
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_on_429(fn, *, max_attempts=8, base_sleep_seconds=15, max_sleep_seconds=90, rate_limiter=None,
+                 retry_server_errors=True):
     """
-    Run a function, retrying with exponential backoff on HTTP 429.
+    Run a function, retrying with exponential backoff on HTTP 429 and, unless told not to, 500/503.
+    
+    A 429 is always rejected before anything is applied, so it is safe to retry any call.
+    A 500/503 can come back after the server already applied the change, so pass
+    retry_server_errors=False for calls that must not run twice (adding sheets, appending
+    or deleting rows/columns).
+    
+    Sleeps for the server's Retry-After when given (never less, up to 50% more), otherwise
+    backs off exponentially with +/-50% random jitter so parallel workers don't retry in lockstep.
+    Calls fail fast while QUOTA_BREAKER is open, i.e. after several calls in a row have
+    exhausted their retries on 429s.
     
     Args:
         fn: Callable to execute (should make a Sheets API call)
         max_attempts: Maximum number of retry attempts (default 8)
         base_sleep_seconds: Initial sleep duration on first 429 (default 15s)
         max_sleep_seconds: Maximum sleep duration (default 90s, covers the 60s quota window)
+        rate_limiter: Optional TokenBucket to acquire from before each attempt
+        retry_server_errors: Also retry on 500/503 (default True; only for calls safe to repeat)
     
     Returns:
         The return value of fn() if successful
         
     Raises:
         The last exception if all retries are exhausted
+        Exception: If QUOTA_BREAKER is open
     """
+    if not QUOTA_BREAKER.allow():
+        raise Exception("Google Sheets API quota still exhausted after repeated retries; "
+                        f"try again in {QUOTA_BREAKER.cooldown_seconds} seconds or later")
     last_exc = None
     for attempt in range(max_attempts):
         try:
-            return fn()
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            result = fn()
+            QUOTA_BREAKER.record_success()
+            return result
         except gspread.exceptions.APIError as e:
             last_exc = e
-            if not is_rate_limit_error(e):
+            if not is_retryable_error(e, retry_server_errors):
                 raise
-            # Calculate sleep with exponential backoff, capped at max
-            sleep_s = min(max_sleep_seconds, base_sleep_seconds * (1.5 ** attempt))
+            # Prefer the server's hint, else exponential backoff capped at max. Either way, spread
+            # the wait randomly so threads that hit the limit together don't wake up together
+            retry_after = _retry_after_seconds(e)
+            if retry_after is not None:
+                sleep_s = random.uniform(retry_after, retry_after * 1.5)
+            else:
+                sleep_s = min(max_sleep_seconds, base_sleep_seconds * (1.5 ** attempt))
+                sleep_s = random.uniform(sleep_s * 0.5, sleep_s * 1.5)
             time.sleep(sleep_s)
-    # Exhausted retries
+    # Exhausted retries; only sustained rate limiting counts towards opening the breaker
+    if is_rate_limit_error(last_exc):
+        QUOTA_BREAKER.record_failure()
     raise last_exc
 
 
-def batch_update_with_retry(spreadsheet, requests, *, chunk_size=200):
+def _send_batch(spreadsheet, requests):
+    """
+    Send one batchUpdate while holding a WRITE_CONCURRENCY slot.
+    """
+    with WRITE_CONCURRENCY:
+        return spreadsheet.batch_update({"requests": requests})
+
+
+def _batch_chunk_size():
+    """
+    Requests per batchUpdate call: FAIRE_BATCH_CHUNK from the environment, else 200.
+    Read at call time so values loaded from .env after import still apply.
+    """
+    try:
+        return max(1, int(os.environ.get("FAIRE_BATCH_CHUNK", 200)))
+    except ValueError:
+        return 200
+
+
+def batch_update_with_retry(spreadsheet, requests, *, chunk_size=None, min_interval_seconds=0.5):
     """
     Execute a Sheets API batchUpdate with automatic 429 retry.
     
+    500/503 are retried too, except for batches that add sheets or append/delete
+    rows/columns, where a replay after a server-side success would repeat the change.
+    
+    Each call is paced by WRITE_RATE_LIMITER so 429s are the exception, not the norm,
+    and WRITE_CONCURRENCY caps how many threads can have a batch in flight at once.
+    Large request lists are split into chunks to stay under the request size cap,
+    with a short pause between chunks so they don't burst through the write quota.
+    Chunked batches are not atomic: if a later chunk fails, the earlier ones stay applied.
+    Batches that add sheets or append/delete rows/columns are therefore always sent
+    whole, so the structural change never lands without the requests that go with it.
+    
     Args:
         spreadsheet: gspread.Spreadsheet object
         requests: List of request dictionaries for batch_update
-        chunk_size: Max requests per batch call (default 200)
+        chunk_size: Max requests per batch call (default FAIRE_BATCH_CHUNK or 200;
+            ignored for structural batches)
+        min_interval_seconds: Pause between consecutive chunks (default 0.5s)
     """
     if not requests:
         return
+    structural = _has_structural_requests(requests)
+    if structural:
+        chunk_size = len(requests)
+    elif chunk_size is None:
+        chunk_size = _batch_chunk_size()
+    retry_server_errors = not structural
     for i in range(0, len(requests), chunk_size):
+        if i and min_interval_seconds:
+            time.sleep(min_interval_seconds)
         batch = requests[i:i + chunk_size]
-        retry_on_429(lambda b=batch: spreadsheet.batch_update({"requests": b}))
+        retry_on_429(lambda b=batch: _send_batch(spreadsheet, b), rate_limiter=WRITE_RATE_LIMITER,
+                     retry_server_errors=retry_server_errors)
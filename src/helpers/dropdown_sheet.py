@@ -2,26 +2,62 @@
 Module for creating the drop-down values sheet in FAIReSheets.
 """
 
+import pandas as pd
+
+from src.helpers.api_retry import batch_update_with_retry
+
+def _cell_value(value):
+    """Build an updateCells cell for one vocab value, leaving blanks and NaN empty."""
+    if value == '' or pd.isna(value):
+        return {}
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
 def create_dropdown_sheet(worksheet, vocab_df, assay_type, assay_name):
     """Create and populate a sheet with all dropdown values."""
     
-    # Replace NaN values with empty strings
-    vocab_df = vocab_df.fillna('')
-    
-    # Convert to list of lists for gspread
+    # Convert to list of lists; NaN cells are left empty by _cell_value
     data = [vocab_df.columns.tolist()] + vocab_df.values.tolist()
     
-    # Resize the worksheet to accommodate the data
+    # Size the worksheet to the data (plus a small buffer)
     rows_needed = len(data) + 5  # Add buffer
     cols_needed = len(data[0]) + 2  # Add buffer
-    worksheet.resize(rows=rows_needed, cols=cols_needed)
-    
-    # Update the worksheet
-    worksheet.update("A1", data)
     
-    # Format the headers
-    worksheet.format("1:1", {
-        "textFormat": {
-            "bold": True
+    # Resize, write the values and bold the header row in one request
+    requests = [
+        {
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": worksheet.id,
+                    "gridProperties": {"rowCount": rows_needed, "columnCount": cols_needed}
+                },
+                "fields": "gridProperties.rowCount,gridProperties.columnCount"
+            }
+        },
+        {
+            "updateCells": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": len(data),
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(data[0])
+                },
+                "rows": [{"values": [_cell_value(cell) for cell in row]} for row in data],
+                "fields": "userEnteredValue"
+            }
+        },
+        {
+            "repeatCell": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": 1
+                },
+                "cell": {"userEnteredFormat": {"textFormat": {"bold": True}}},
+                "fields": "userEnteredFormat.textFormat.bold"
+            }
         }
-    }) 
\ No newline at end of file
+    ]
+    batch_update_with_retry(worksheet.spreadsheet, requests)
@@ -3,17 +3,16 @@ Module for creating the experimentRunMetadata sheet in FAIReSheets.
 """
 
 import pandas as pd
-import numpy as np
-import time
-import json
-import gspread_formatting as gsf
-import gspread
+from itertools import groupby
+
+from src.helpers.api_retry import batch_update_with_retry
+from src.helpers.template_loader import read_template_sheet
 
 def create_experiment_metadata_sheet(worksheet, full_temp_file_name, input_df, req_lev, color_styles, vocab_df, experimentRunMetadata_user=None):
     """Create and format the experimentRunMetadata sheet."""
     
     # Read the template using pandas
-    sheet_df = pd.read_excel(full_temp_file_name, sheet_name="experimentRunMetadata", header=None)
+    sheet_df = read_template_sheet(full_temp_file_name, "experimentRunMetadata", header=None)
     
     # Replace NaN values with empty strings to avoid JSON errors
     sheet_df = sheet_df.fillna('')
@@ -35,15 +34,9 @@ def create_experiment_metadata_sheet(worksheet, full_temp_file_name, input_df, r
     # Filter by requirement level
     if req_lev_row is not None:
         req_lev2rm = [level for level in ['M', 'HR', 'R', 'O'] if level not in req_lev]
-        cols_to_drop = []
-        
-        for col_idx in range(sheet_df.shape[1]):
-            if sheet_df.iloc[req_lev_row, col_idx] in req_lev2rm:
-                cols_to_drop.append(col_idx)
-        
-        # Drop columns with unwanted requirement levels
-        if cols_to_drop:
-            sheet_df = sheet_df.drop(columns=sheet_df.columns[cols_to_drop])
+        # Keep only columns whose requirement level was requested
+        drop_mask = sheet_df.iloc[req_lev_row].isin(req_lev2rm).values
+        sheet_df = sheet_df.loc[:, ~drop_mask]
     
     # Add user-defined fields if provided
     if experimentRunMetadata_user and term_name_row is not None and req_lev_row is not None and section_row is not None:
@@ -60,16 +53,35 @@ def create_experiment_metadata_sheet(worksheet, full_temp_file_name, input_df, r
     # Convert to list of lists for gspread
     data = sheet_df.values.tolist()
     
-    # Resize worksheet to accommodate all data (add some buffer)
+    # Size the worksheet to the data (add some buffer)
     rows_needed = len(data) + 20  # Add buffer
     cols_needed = len(data[0]) + 10 if data else 50  # Add buffer
-    worksheet.resize(rows=rows_needed, cols=cols_needed)
-    
-    # Update the worksheet with all data at once
-    worksheet.update("A1", data)
     
-    # Prepare batch requests for formatting
-    batch_requests = []
+    # Resize and write the data in the same batch as the formatting
+    batch_requests = [
+        {
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": worksheet.id,
+                    "gridProperties": {"rowCount": rows_needed, "columnCount": cols_needed}
+                },
+                "fields": "gridProperties.rowCount,gridProperties.columnCount"
+            }
+        },
+        {
+            "updateCells": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": len(data),
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(data[0])
+                },
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": str(cell)}} for cell in row]} for row in data],
+                "fields": "userEnteredValue"
+            }
+        }
+    ]
     
     # Format term_name row with bold
     batch_requests.append({
@@ -96,105 +108,107 @@ def create_experiment_metadata_sheet(worksheet, full_temp_file_name, input_df, r
     if req_lev_row is not None:
         for col_idx, req_level in enumerate(data[req_lev_row]):
             if req_level in color_styles and req_level in req_lev:
-                color_obj = color_styles[req_level]
-                if hasattr(color_obj, 'backgroundColor') and hasattr(color_obj.backgroundColor, 'red'):
-                    batch_requests.append({
-                        "repeatCell": {
-                            "range": {
-                                "sheetId": worksheet.id,
-                                "startRowIndex": req_lev_row,
-                                "endRowIndex": req_lev_row + 1,
-                                "startColumnIndex": col_idx,
-                                "endColumnIndex": col_idx + 1
-                            },
-                            "cell": {
-                                "userEnteredFormat": {
-                                    "backgroundColor": {
-                                        "red": float(color_obj.backgroundColor.red),
-                                        "green": float(color_obj.backgroundColor.green),
-                                        "blue": float(color_obj.backgroundColor.blue)
-                                    }
-                                }
-                            },
-                            "fields": "userEnteredFormat.backgroundColor"
-                        }
-                    })
+                batch_requests.append({
+                    "repeatCell": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": req_lev_row,
+                            "endRowIndex": req_lev_row + 1,
+                            "startColumnIndex": col_idx,
+                            "endColumnIndex": col_idx + 1
+                        },
+                        "cell": {
+                            "userEnteredFormat": {
+                                "backgroundColor": color_styles[req_level]
+                            }
+                        },
+                        "fields": "userEnteredFormat.backgroundColor"
+                    }
+                })
     
     # Get column names from the term_name row
     term_names = data[term_name_row] if term_name_row < len(data) else []
+    
+    # Index the vocabulary and checklist rows by term once instead of scanning them per column
+    has_n_options = 'n_options' in vocab_df.columns
+    vocab_lookup = vocab_df.drop_duplicates('term_name').set_index('term_name').to_dict(orient='index')
+    info_lookup = input_df.drop_duplicates('term_name').set_index('term_name').to_dict(orient='index')
         
+    # Dropdown options and notes per column, turned into requests after the loop
+    column_vocab = {}
+    column_notes = {}
+    
     # Add dropdowns and comments in batches
     for col_idx, term in enumerate(term_names):
         if not term or pd.isna(term):
             continue
             
         # Handle dropdowns
-        vocab_row = vocab_df[vocab_df['term_name'] == term]
-        if not vocab_row.empty and 'n_options' in vocab_row.columns:
-            n_options = int(vocab_row.iloc[0]['n_options'])
-            values = [str(vocab_row.iloc[0][f'vocab{j+1}']) for j in range(n_options) 
-                    if f'vocab{j+1}' in vocab_row.columns and pd.notna(vocab_row.iloc[0][f'vocab{j+1}'])]
+        vocab_row = vocab_lookup.get(term)
+        if vocab_row is not None and has_n_options:
+            n_options = int(vocab_row['n_options'])
+            values = [str(vocab_row[f'vocab{j+1}']) for j in range(n_options) 
+                    if f'vocab{j+1}' in vocab_row and pd.notna(vocab_row[f'vocab{j+1}'])]
             
             if values:
-                batch_requests.append({
-                    "setDataValidation": {
-                        "range": {
-                            "sheetId": worksheet.id,
-                            "startRowIndex": term_name_row + 1,
-                            "endRowIndex": term_name_row + 20,
-                            "startColumnIndex": col_idx,
-                            "endColumnIndex": col_idx + 1
-                        },
-                        "rule": {
-                            "condition": {
-                                "type": "ONE_OF_LIST",
-                                "values": [{"userEnteredValue": v} for v in values]
-                            },
-                            "showCustomUi": True
-                        }
-                    }
-                })
+                column_vocab[col_idx] = tuple(values)
         
         # Handle comments
-        term_info = input_df[input_df['term_name'] == term]
-        if not term_info.empty:
-            comment = f"Requirement level: {term_info.iloc[0]['requirement_level']}"
-            if not pd.isna(term_info.iloc[0]['requirement_level_condition']):
-                comment += f" ({term_info.iloc[0]['requirement_level_condition']})"
-            comment += f"\nDescription: {term_info.iloc[0]['description']}"
-            comment += f"\nExample: {term_info.iloc[0]['example']}"
-            comment += f"\nField type: {term_info.iloc[0]['term_type']}"
+        term_info = info_lookup.get(term)
+        if term_info is not None:
+            comment = f"Requirement level: {term_info['requirement_level']}"
+            if not pd.isna(term_info['requirement_level_condition']):
+                comment += f" ({term_info['requirement_level_condition']})"
+            comment += f"\nDescription: {term_info['description']}"
+            comment += f"\nExample: {term_info['example']}"
+            comment += f"\nField type: {term_info['term_type']}"
             
-            if term_info.iloc[0]['term_type'] == 'controlled vocabulary':
-                comment += f" ({term_info.iloc[0]['controlled_vocabulary_options']})"
-            elif term_info.iloc[0]['term_type'] == 'fixed format':
-                comment += f" ({term_info.iloc[0]['fixed_format']})"
+            if term_info['term_type'] == 'controlled vocabulary':
+                comment += f" ({term_info['controlled_vocabulary_options']})"
+            elif term_info['term_type'] == 'fixed format':
+                comment += f" ({term_info['fixed_format']})"
             
+            column_notes[col_idx] = comment
+    
+    # All notes sit on the term name row, so write them in a single updateCells
+    if column_notes:
+        last_col = max(column_notes)
+        batch_requests.append({
+            "updateCells": {
+                "start": {
+                    "sheetId": worksheet.id,
+                    "rowIndex": term_name_row,
+                    "columnIndex": 0
+                },
+                "rows": [{"values": [{"note": column_notes[c]} if c in column_notes else {}
+                                     for c in range(last_col + 1)]}],
+                "fields": "note"
+            }
+        })
+    
+    # One dropdown request per run of adjacent columns sharing the same options
+    for values, run in groupby(range(len(term_names)), key=lambda c: column_vocab.get(c, ())):
+        if values:
+            run = list(run)
             batch_requests.append({
-                "updateCells": {
+                "setDataValidation": {
                     "range": {
                         "sheetId": worksheet.id,
-                        "startRowIndex": term_name_row,
-                        "endRowIndex": term_name_row + 1,
-                        "startColumnIndex": col_idx,
-                        "endColumnIndex": col_idx + 1
+                        "startRowIndex": term_name_row + 1,
+                        "endRowIndex": term_name_row + 20,
+                        "startColumnIndex": run[0],
+                        "endColumnIndex": run[-1] + 1
                     },
-                    "rows": [{"values": [{"note": comment}]}],
-                    "fields": "note"
+                    "rule": {
+                        "condition": {
+                            "type": "ONE_OF_LIST",
+                            "values": [{"userEnteredValue": v} for v in values]
+                        },
+                        "showCustomUi": True
+                    }
                 }
             })
     
-    # Apply all formatting, dropdowns, and notes in one batch
+    # Apply the data, formatting, dropdowns, and notes in one batch
     if batch_requests:
-        try:
-            worksheet.spreadsheet.batch_update({'requests': batch_requests})
-        except gspread.exceptions.APIError as e:
-            if "429" in str(e):  # Rate limit error
-                print("Warning: Hit API rate limit. Waiting 60 seconds before retrying...")
-                time.sleep(60)  # Wait a full minute
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            else:
-                raise
-    
-    # Reduced wait time (from 1 second to 0.5)
-    time.sleep(0.5) 
\ No newline at end of file
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
@@ -2,7 +2,7 @@
 Module for creating other sheet types in FAIReSheets.
 """
 
-import pandas as pd
+from src.helpers.template_loader import read_template_sheet
 
 def create_other_sheets(worksheets, sheet_names, full_temp_file_name, input_df, req_lev, color_styles, vocab_df):
     """Create and format other sheets based on assay type."""
@@ -11,7 +11,7 @@ def create_other_sheets(worksheets, sheet_names, full_temp_file_name, input_df,
         worksheet = worksheets[sheet_name]
         
         # Read the template using pandas instead of openpyxl
-        sheet_df = pd.read_excel(full_temp_file_name, sheet_name=sheet_name, header=None)
+        sheet_df = read_template_sheet(full_temp_file_name, sheet_name, header=None)
         
         # Replace NaN values with empty strings to avoid JSON errors
         sheet_df = sheet_df.fillna('')
@@ -25,4 +25,4 @@ def create_other_sheets(worksheets, sheet_names, full_temp_file_name, input_df,
         worksheet.resize(rows=rows_needed, cols=cols_needed)
         
         # Write to Google Sheets
-        worksheet.update("A1", data) 
\ No newline at end of file
+        worksheet.update(range_name="A1", values=data, value_input_option='RAW')
\ No newline at end of file
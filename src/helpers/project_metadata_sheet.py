@@ -5,12 +5,15 @@ Module for creating the projectMetadata sheet in FAIReSheets.
 import pandas as pd
 import gspread_formatting as gsf
 
+from src.helpers.api_retry import batch_update_with_retry
+from src.helpers.template_loader import read_template_sheet
+
 def create_project_metadata_sheet(worksheet, full_temp_file_name, input_df, req_lev, assay_type,
                                   project_id, assay_name, projectMetadata_user, color_styles, vocab_df, FAIRe_checklist_ver):
     """Create and format the projectMetadata sheet."""
     
     # Read the projectMetadata sheet from the template
-    project_meta_df = pd.read_excel(full_temp_file_name, sheet_name="projectMetadata")
+    project_meta_df = read_template_sheet(full_temp_file_name, "projectMetadata")
     
     # Replace NaN values with empty strings immediately after loading
     project_meta_df = project_meta_df.fillna('')
@@ -86,7 +89,7 @@ def create_project_metadata_sheet(worksheet, full_temp_file_name, input_df, req_
     worksheet.resize(rows=rows_needed, cols=cols_needed)
     
     # Update the worksheet
-    worksheet.update("A1", data)
+    worksheet.update(range_name="A1", values=data, value_input_option='RAW')
     
     # Format headers and cells using format_cell_ranges
     header_format = gsf.CellFormat(textFormat=gsf.TextFormat(bold=True))
@@ -184,9 +187,8 @@ def create_project_metadata_sheet(worksheet, full_temp_file_name, input_df, req_
                             }
                             validation_requests.append(assay_validation_rule)
     
-    # Apply all data validations in a single batch request
-    if validation_requests:
-        worksheet.spreadsheet.batch_update({'requests': validation_requests})
+    # Apply all data validations in a single batch request, paced and retried on 429
+    batch_update_with_retry(worksheet.spreadsheet, validation_requests)
     
     # Batch all note requests
     note_requests = []
@@ -253,6 +255,5 @@ def create_project_metadata_sheet(worksheet, full_temp_file_name, input_df, req_
                     }
                     note_requests.append(note_request)
     
-    # Apply all notes in a single batch request
-    if note_requests:
-        worksheet.spreadsheet.batch_update({'requests': note_requests}) 
\ No newline at end of file
+    # Apply all notes in a single batch request, paced and retried on 429
+    batch_update_with_retry(worksheet.spreadsheet, note_requests) 
\ No newline at end of file
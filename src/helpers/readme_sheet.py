@@ -7,8 +7,14 @@ from datetime import datetime
 import gspread_formatting as gsf
 
 def create_readme_sheet(worksheet, input_file_name, req_lev, sample_type, assay_type,
-                        project_id, assay_name, projectMetadata_user, sampleMetadata_user, experimentRunMetadata_user, color_styles, FAIRe_checklist_ver):
-    """Create the README sheet with information about the template."""
+                        project_id, assay_name, projectMetadata_user, sampleMetadata_user, experimentRunMetadata_user, color_styles, FAIRe_checklist_ver,
+                        sheet_titles=None):
+    """
+    Create the README sheet with information about the template.
+    
+    sheet_titles is the spreadsheet's current sheet order when the caller already knows it;
+    otherwise it is read from the spreadsheet.
+    """
 
     # Format ISO time like in R script
     now = datetime.now()
@@ -33,8 +39,10 @@ def create_readme_sheet(worksheet, input_file_name, req_lev, sample_type, assay_
     ]
     
     # Get all worksheet names except README and Drop-down values
-    sheet_names = [ws.title for ws in worksheet.spreadsheet.worksheets() 
-                  if ws.title not in ["README", "Drop-down values"]]
+    if sheet_titles is None:
+        sheet_titles = [ws.title for ws in worksheet.spreadsheet.worksheets()]
+    sheet_names = [title for title in sheet_titles
+                  if title not in ["README", "Drop-down values"]]
     
     # Create rows for each sheet (empty timestamp and email cells)
     readme_timestamp_rows = [[name, '', ''] for name in sheet_names]
@@ -110,7 +118,7 @@ def create_readme_sheet(worksheet, input_file_name, req_lev, sample_type, assay_
     readme_data = readme1 + readme_timestamp_header + readme_timestamp_rows + readme2 + readme3 + readme4
     
     # Write data to sheet - all at once to reduce API calls
-    worksheet.update('A1', readme_data)
+    worksheet.update(range_name='A1', values=readme_data, value_input_option='RAW')
     
     # Format header rows (bold) using format_cell_ranges
     header_format = gsf.CellFormat(textFormat=gsf.TextFormat(bold=True))
@@ -133,10 +141,7 @@ def create_readme_sheet(worksheet, input_file_name, req_lev, sample_type, assay_
         (f'A{sheets_section_start}:A{sheets_section_start}', header_format)   # Sheets in this Google sheet
     ]
     
-    # Apply all formatting at once
-    gsf.format_cell_ranges(worksheet, format_ranges)
-    
-    # Apply color formatting to requirement levels - separate call to ensure correct formatting
+    # Add color formatting for the requirement level rows
     req_level_rows = {
         'M': req_levels_start + 1,
         'HR': req_levels_start + 2,
@@ -146,4 +151,7 @@ def create_readme_sheet(worksheet, input_file_name, req_lev, sample_type, assay_
     
     for level, row in req_level_rows.items():
         if level in color_styles:
-            gsf.format_cell_range(worksheet, f'A{row}:A{row}', color_styles[level]) 
\ No newline at end of file
+            format_ranges.append((f'A{row}:A{row}', color_styles[level]))
+    
+    # Apply all formatting, headers and colors, in one batchUpdate
+    gsf.format_cell_ranges(worksheet, format_ranges)
\ No newline at end of file
@@ -3,18 +3,16 @@ Module for creating the sampleMetadata sheet in FAIReSheets.
 """
 
 import pandas as pd
-import numpy as np
-import time
-import json
-import gspread_formatting as gsf
-import gspread
+
+from src.helpers.api_retry import batch_update_with_retry
+from src.helpers.template_loader import read_template_sheet
 
 def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_lev, sample_type,
                                  assay_type, assay_name, sampleMetadata_user, color_styles, vocab_df):
     """Create and format the sampleMetadata sheet."""
     
     # Read the template sheet
-    sheet_df = pd.read_excel(full_temp_file_name, sheet_name="sampleMetadata", header=None)
+    sheet_df = read_template_sheet(full_temp_file_name, "sampleMetadata", header=None)
     sheet_df = sheet_df.fillna('')
     
     # Find key rows
@@ -116,7 +114,7 @@ def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_l
     
     # Update the worksheet with all data at once - only add a few rows for the user to fill in
     worksheet.resize(rows=int(term_name_row + 10), cols=int(len(data[0]) + 5))  # Just a few rows needed
-    worksheet.update("A1", data)
+    worksheet.update(range_name="A1", values=data, value_input_option='RAW')
     
     # Prepare batch requests for formatting
     batch_requests = []
@@ -145,36 +143,32 @@ def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_l
     # Format requirement level cells with colors
     for i, level in enumerate(sheet_df.iloc[req_level_row]):
         if level in color_styles and level in req_lev:
-            # Get color from the color_styles dictionary
-            color_obj = color_styles[level]
-            if hasattr(color_obj, 'backgroundColor'):
-                # Extract RGB values from the color object
-                if hasattr(color_obj.backgroundColor, 'red'):
-                    batch_requests.append({
-                        "repeatCell": {
-                            "range": {
-                                "sheetId": worksheet.id,
-                                "startRowIndex": req_level_row,
-                                "endRowIndex": req_level_row + 1,
-                                "startColumnIndex": i,
-                                "endColumnIndex": i + 1
-                            },
-                            "cell": {
-                                "userEnteredFormat": {
-                                    "backgroundColor": {
-                                        "red": float(color_obj.backgroundColor.red),
-                                        "green": float(color_obj.backgroundColor.green),
-                                        "blue": float(color_obj.backgroundColor.blue)
-                                    }
-                                }
-                            },
-                            "fields": "userEnteredFormat.backgroundColor"
+            batch_requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": worksheet.id,
+                        "startRowIndex": req_level_row,
+                        "endRowIndex": req_level_row + 1,
+                        "startColumnIndex": i,
+                        "endColumnIndex": i + 1
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "backgroundColor": color_styles[level]
                         }
-                    })
+                    },
+                    "fields": "userEnteredFormat.backgroundColor"
+                }
+            })
     
     # Get column names for reference
     term_names = sheet_df.iloc[term_name_row].tolist()
     
+    # Index the vocabulary and checklist rows by term once instead of scanning them per column
+    has_n_options = 'n_options' in vocab_df.columns
+    vocab_lookup = vocab_df.drop_duplicates('term_name').set_index('term_name').to_dict(orient='index')
+    info_lookup = input_df.drop_duplicates('term_name').set_index('term_name').to_dict(orient='index')
+    
     # Prepare note updates list
     note_updates = []
     
@@ -184,11 +178,11 @@ def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_l
             continue
             
         # Handle dropdowns
-        vocab_row = vocab_df[vocab_df['term_name'] == term]
-        if not vocab_row.empty and 'n_options' in vocab_row.columns:
-            n_options = int(vocab_row.iloc[0]['n_options'])
-            values = [str(vocab_row.iloc[0][f'vocab{j+1}']) for j in range(n_options) 
-                    if f'vocab{j+1}' in vocab_row.columns and pd.notna(vocab_row.iloc[0][f'vocab{j+1}'])]
+        vocab_row = vocab_lookup.get(term)
+        if vocab_row is not None and has_n_options:
+            n_options = int(vocab_row['n_options'])
+            values = [str(vocab_row[f'vocab{j+1}']) for j in range(n_options) 
+                    if f'vocab{j+1}' in vocab_row and pd.notna(vocab_row[f'vocab{j+1}'])]
             
             if values:
                 batch_requests.append({
@@ -212,20 +206,20 @@ def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_l
         
         # Handle comments
         term_for_lookup = 'detected_notDetected' if term.startswith('detected_notDetected_') else term
-        term_info = input_df[input_df['term_name'] == term_for_lookup]
+        term_info = info_lookup.get(term_for_lookup)
         
-        if not term_info.empty:
-            comment = f"Requirement level: {term_info.iloc[0]['requirement_level']}"
-            if not pd.isna(term_info.iloc[0]['requirement_level_condition']):
-                comment += f" ({term_info.iloc[0]['requirement_level_condition']})"
-            comment += f"\nDescription: {term_info.iloc[0]['description']}"
-            comment += f"\nExample: {term_info.iloc[0]['example']}"
-            comment += f"\nField type: {term_info.iloc[0]['term_type']}"
+        if term_info is not None:
+            comment = f"Requirement level: {term_info['requirement_level']}"
+            if not pd.isna(term_info['requirement_level_condition']):
+                comment += f" ({term_info['requirement_level_condition']})"
+            comment += f"\nDescription: {term_info['description']}"
+            comment += f"\nExample: {term_info['example']}"
+            comment += f"\nField type: {term_info['term_type']}"
             
-            if term_info.iloc[0]['term_type'] == 'controlled vocabulary':
-                comment += f" ({term_info.iloc[0]['controlled_vocabulary_options']})"
-            elif term_info.iloc[0]['term_type'] == 'fixed format':
-                comment += f" ({term_info.iloc[0]['fixed_format']})"
+            if term_info['term_type'] == 'controlled vocabulary':
+                comment += f" ({term_info['controlled_vocabulary_options']})"
+            elif term_info['term_type'] == 'fixed format':
+                comment += f" ({term_info['fixed_format']})"
             
             note_updates.append({
                 "range": f"{chr(65+i)}{term_name_row+1}",
@@ -251,15 +245,4 @@ def create_sample_metadata_sheet(worksheet, full_temp_file_name, input_df, req_l
             })
         
         # Apply all formatting and notes in one batch
-        try:
-            worksheet.spreadsheet.batch_update({'requests': batch_requests})
-        except gspread.exceptions.APIError as e:
-            if "429" in str(e):  # Rate limit error
-                print("Warning: Hit API rate limit. Waiting 60 seconds before retrying...")
-                time.sleep(60)  # Wait a full minute
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            else:
-                raise
-    
-    # Wait to avoid rate limits - reduced from 2 seconds to 1 second
-    time.sleep(1) 
\ No newline at end of file
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests)
@@ -6,11 +6,10 @@ standard curves, quantitative data, and amplification data.
 """
 
 import pandas as pd
-import numpy as np
-import time
-import json
-import gspread_formatting as gsf
-import gspread
+import traceback
+
+from src.helpers.api_retry import batch_update_with_retry
+from src.helpers.template_loader import read_template_sheet
 
 def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_template_df, input_df, req_lev, 
                           color_styles, vocab_df, project_id, assay_name):
@@ -22,7 +21,7 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
             print(f"\nProcessing {sheet_name} sheet...")
             
             # Read the template directly from the Excel file
-            sheet_df = pd.read_excel(full_temp_file_path, sheet_name=sheet_name, header=None)
+            sheet_df = read_template_sheet(full_temp_file_path, sheet_name, header=None)
             print(f"Successfully read sheet from file: {sheet_name}")
             
             # Replace NaN values with empty strings to avoid JSON errors
@@ -57,16 +56,11 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
             # Filter columns based on requirement level
             if req_level_row is not None:
                 req_lev2rm = [level for level in ['M', 'HR', 'R', 'O'] if level not in req_lev]
-                cols_to_drop = []
-                
-                for col_idx in range(sheet_df.shape[1]):
-                    if sheet_df.iloc[req_level_row, col_idx] in req_lev2rm:
-                        cols_to_drop.append(col_idx)
-                
-                # Drop columns with unwanted requirement levels
-                if cols_to_drop:
-                    sheet_df = sheet_df.drop(columns=sheet_df.columns[cols_to_drop])
-                    print(f"Dropped {len(cols_to_drop)} columns with requirement levels not in {req_lev}")
+                # Keep only columns whose requirement level was requested
+                drop_mask = sheet_df.iloc[req_level_row].isin(req_lev2rm).values
+                sheet_df = sheet_df.loc[:, ~drop_mask]
+                if drop_mask.any():
+                    print(f"Dropped {drop_mask.sum()} columns with requirement levels not in {req_lev}")
             
             # Convert to list of lists for gspread
             data = sheet_df.values.tolist()
@@ -78,7 +72,7 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
             worksheet.resize(rows=rows_needed, cols=cols_needed)
             
             # Update the worksheet with all data at once
-            worksheet.update("A1", data)
+            worksheet.update(range_name="A1", values=data, value_input_option='RAW')
             
             # Prepare batch requests for formatting
             batch_requests = []
@@ -107,32 +101,23 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
             # Format requirement level cells with colors
             for i, level in enumerate(sheet_df.iloc[req_level_row]):
                 if level in color_styles and level in req_lev:
-                    # Get color from the color_styles dictionary
-                    color_obj = color_styles[level]
-                    if hasattr(color_obj, 'backgroundColor'):
-                        # Extract RGB values from the color object
-                        if hasattr(color_obj.backgroundColor, 'red'):
-                            batch_requests.append({
-                                "repeatCell": {
-                                    "range": {
-                                        "sheetId": worksheet.id,
-                                        "startRowIndex": req_level_row,
-                                        "endRowIndex": req_level_row + 1,
-                                        "startColumnIndex": i,
-                                        "endColumnIndex": i + 1
-                                    },
-                                    "cell": {
-                                        "userEnteredFormat": {
-                                            "backgroundColor": {
-                                                "red": float(color_obj.backgroundColor.red),
-                                                "green": float(color_obj.backgroundColor.green),
-                                                "blue": float(color_obj.backgroundColor.blue)
-                                            }
-                                        }
-                                    },
-                                    "fields": "userEnteredFormat.backgroundColor"
+                    batch_requests.append({
+                        "repeatCell": {
+                            "range": {
+                                "sheetId": worksheet.id,
+                                "startRowIndex": req_level_row,
+                                "endRowIndex": req_level_row + 1,
+                                "startColumnIndex": i,
+                                "endColumnIndex": i + 1
+                            },
+                            "cell": {
+                                "userEnteredFormat": {
+                                    "backgroundColor": color_styles[level]
                                 }
-                            })
+                            },
+                            "fields": "userEnteredFormat.backgroundColor"
+                        }
+                    })
             
             # Get term names from the last row (these are column names)
             term_names = sheet_df.iloc[term_name_row].tolist()
@@ -202,15 +187,7 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
             
             # Apply all formatting, dropdowns, and notes in one batch
             if batch_requests:
-                try:
-                    worksheet.spreadsheet.batch_update({'requests': batch_requests})
-                except gspread.exceptions.APIError as e:
-                    if "429" in str(e):  # Rate limit error
-                        print("Warning: Hit API rate limit. Waiting 60 seconds before retrying...")
-                        time.sleep(60)  # Wait a full minute
-                        worksheet.spreadsheet.batch_update({'requests': batch_requests})
-                    else:
-                        raise
+                batch_update_with_retry(worksheet.spreadsheet, batch_requests)
             
             # Add project_id and assay_name if columns exist
             for col_idx, term in enumerate(term_names):
@@ -228,6 +205,5 @@ def create_targeted_sheets(worksheets, sheet_names, full_temp_file_path, full_te
                 
         except Exception as e:
             print(f"Error processing {sheet_name} sheet: {e}")
-            import traceback
             traceback.print_exc()
             continue
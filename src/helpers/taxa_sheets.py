@@ -3,17 +3,15 @@ Module for creating taxa sheets (taxaRaw and taxaFinal) in FAIReSheets.
 """
 
 import pandas as pd
-import numpy as np
-import time
-import json
-import gspread_formatting as gsf
-import gspread
+
+from src.helpers.api_retry import batch_update_with_retry
+from src.helpers.template_loader import read_template_sheet
 
 def create_taxa_sheets(worksheet, sheet_name, full_temp_file_name, input_df, req_lev, color_styles, vocab_df):
     """Create and format taxa sheets (taxaRaw or taxaFinal)."""
     
     # Read the template using pandas
-    sheet_df = pd.read_excel(full_temp_file_name, sheet_name=sheet_name, header=None)
+    sheet_df = read_template_sheet(full_temp_file_name, sheet_name, header=None)
     
     # Replace NaN values with empty strings to avoid JSON errors
     sheet_df = sheet_df.fillna('')
@@ -33,15 +31,9 @@ def create_taxa_sheets(worksheet, sheet_name, full_temp_file_name, input_df, req
     # Filter by requirement level
     if req_lev_row is not None:
         req_lev2rm = [level for level in ['M', 'HR', 'R', 'O'] if level not in req_lev]
-        cols_to_drop = []
-        
-        for col_idx in range(sheet_df.shape[1]):
-            if sheet_df.iloc[req_lev_row, col_idx] in req_lev2rm:
-                cols_to_drop.append(col_idx)
-        
-        # Drop columns with unwanted requirement levels
-        if cols_to_drop:
-            sheet_df = sheet_df.drop(columns=sheet_df.columns[cols_to_drop])
+        # Keep only columns whose requirement level was requested
+        drop_mask = sheet_df.iloc[req_lev_row].isin(req_lev2rm).values
+        sheet_df = sheet_df.loc[:, ~drop_mask]
     
     # Convert to list of lists for gspread
     data = sheet_df.values.tolist()
@@ -52,7 +44,7 @@ def create_taxa_sheets(worksheet, sheet_name, full_temp_file_name, input_df, req
     worksheet.resize(rows=rows_needed, cols=cols_needed)
     
     # Update the worksheet with all data at once
-    worksheet.update("A1", data)
+    worksheet.update(range_name="A1", values=data, value_input_option='RAW')
     
     # Prepare batch requests for formatting
     batch_requests = []
@@ -82,29 +74,23 @@ def create_taxa_sheets(worksheet, sheet_name, full_temp_file_name, input_df, req
     if req_lev_row is not None:
         for col_idx, req_level in enumerate(data[req_lev_row]):
             if req_level in color_styles and req_level in req_lev:
-                color_obj = color_styles[req_level]
-                if hasattr(color_obj, 'backgroundColor') and hasattr(color_obj.backgroundColor, 'red'):
-                    batch_requests.append({
-                        "repeatCell": {
-                            "range": {
-                                "sheetId": worksheet.id,
-                                "startRowIndex": req_lev_row,
-                                "endRowIndex": req_lev_row + 1,
-                                "startColumnIndex": col_idx,
-                                "endColumnIndex": col_idx + 1
-                            },
-                            "cell": {
-                                "userEnteredFormat": {
-                                    "backgroundColor": {
-                                        "red": float(color_obj.backgroundColor.red),
-                                        "green": float(color_obj.backgroundColor.green),
-                                        "blue": float(color_obj.backgroundColor.blue)
-                                    }
-                                }
-                            },
-                            "fields": "userEnteredFormat.backgroundColor"
-                        }
-                    })
+                batch_requests.append({
+                    "repeatCell": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": req_lev_row,
+                            "endRowIndex": req_lev_row + 1,
+                            "startColumnIndex": col_idx,
+                            "endColumnIndex": col_idx + 1
+                        },
+                        "cell": {
+                            "userEnteredFormat": {
+                                "backgroundColor": color_styles[req_level]
+                            }
+                        },
+                        "fields": "userEnteredFormat.backgroundColor"
+                    }
+                })
     
     # Get column names from the term_name row
     term_names = data[term_name_row] if term_name_row < len(data) else []
@@ -172,12 +158,4 @@ def create_taxa_sheets(worksheet, sheet_name, full_temp_file_name, input_df, req
     
     # Apply all formatting, dropdowns, and notes in one batch
     if batch_requests:
-        try:
-            worksheet.spreadsheet.batch_update({'requests': batch_requests})
-        except gspread.exceptions.APIError as e:
-            if "429" in str(e):  # Rate limit error
-                print("Warning: Hit API rate limit. Waiting 60 seconds before retrying...")
-                time.sleep(60)  # Wait a full minute
-                worksheet.spreadsheet.batch_update({'requests': batch_requests})
-            else:
-                raise 
\ No newline at end of file
+        batch_update_with_retry(worksheet.spreadsheet, batch_requests) 
\ No newline at end of file
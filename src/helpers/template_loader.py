@@ -0,0 +1,34 @@
+"""
+Memoized reader for the FAIRe template workbook.
+
+The sheet builders each pull one tab out of the same FULLtemplate file. Opening
+the workbook is the expensive part, so it is parsed once per process and every
+tab is read from the cached handle.
+"""
+
+import os
+from functools import lru_cache
+import pandas as pd
+
+
+@lru_cache(maxsize=4)
+def _open_template(path, mtime):
+    # mtime is part of the key so an edited template is picked up again
+    return pd.ExcelFile(path, engine='openpyxl')
+
+
+def read_template_sheet(path, sheet_name, header=0):
+    """
+    Read one sheet (or all sheets when sheet_name is None) of a template workbook.
+    
+    Args:
+        path: Path to the .xlsx template
+        sheet_name: Sheet to read, or None for a dict of every sheet
+        header: Row to use as the column header, as in pd.read_excel
+    
+    Returns:
+        A fresh DataFrame (or dict of DataFrames) that callers may modify freely
+    """
+    path = os.path.abspath(path)
+    workbook = _open_template(path, os.path.getmtime(path))
+    return workbook.parse(sheet_name=sheet_name, header=header)